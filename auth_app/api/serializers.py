@@ -4,15 +4,33 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
 from rest_framework.validators import UniqueValidator
+from base_app import links, thumbnails
+from base_app.api.serializer import MediaFileField
+from reviews_app import ratings
 
 
 def get_file_url(obj, context):
     request = context.get("request")
     if obj.file and request:
-        return request.build_absolute_uri(obj.file.url)
+        return links.get_media_url(obj.file, request)
     return None
 
 
+def get_file_variant_urls(obj, context):
+    return thumbnails.get_variant_urls(obj.file, context.get("request"), obj.file_variant_names)
+
+
+def get_business_rating(obj):
+    """
+    Return the review aggregates of a business profile, None for customers.
+
+    Select user__business_rating with the profile to avoid a query per profile.
+    """
+    if obj.type != "business":
+        return None
+    return ratings.to_representation(getattr(obj.user, "business_rating", None))
+
+
 class UserNestedSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -23,11 +41,13 @@ class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
     first_name = serializers.CharField(source="user.first_name", required=False, allow_blank=True)
     last_name = serializers.CharField(source="user.last_name", required=False, allow_blank=True)
-    file = serializers.FileField(required=False, allow_null=True)
+    file = MediaFileField(required=False, allow_null=True)
+    file_variants = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = "__all__"
+        exclude = ["file_variant_names"]
 
     def update(self, instance, validated_data):
         user_data = validated_data.pop("user", {})
@@ -44,6 +64,12 @@ class ProfileSerializer(serializers.ModelSerializer):
 
         return super().update(instance, validated_data)
 
+    def get_file_variants(self, obj):
+        return get_file_variant_urls(obj, self.context)
+
+    def get_rating(self, obj):
+        return get_business_rating(obj)
+
 
 class RegistrationSerializer(serializers.Serializer):
     username = serializers.CharField(
@@ -109,26 +135,37 @@ class LoginSerializer(serializers.Serializer):
 class BusinessUserListSerializer(serializers.ModelSerializer):
     user = UserNestedSerializer(read_only=True)
     file = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
         fields = [
             "user",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
             "working_hours",
             "type",
+            "rating",
         ]
 
     def get_file(self, obj):
         return get_file_url(obj, self.context)
 
+    def get_file_variants(self, obj):
+        return get_file_variant_urls(obj, self.context)
+
+    def get_rating(self, obj):
+        return get_business_rating(obj)
+
 
 class CustomerUserListSerializer(serializers.ModelSerializer):
     user = UserNestedSerializer(read_only=True)
     file = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
     uploaded_at = serializers.SerializerMethodField()
 
     class Meta:
@@ -136,6 +173,7 @@ class CustomerUserListSerializer(serializers.ModelSerializer):
         fields = [
             "user",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
@@ -146,5 +184,8 @@ class CustomerUserListSerializer(serializers.ModelSerializer):
     def get_file(self, obj):
         return get_file_url(obj, self.context)
 
+    def get_file_variants(self, obj):
+        return get_file_variant_urls(obj, self.context)
+
     def get_uploaded_at(self, obj):
         return obj.created_at
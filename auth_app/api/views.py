@@ -1,10 +1,10 @@
-from rest_framework import generics
+from rest_framework import generics, filters
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.authtoken.models import Token
 from auth_app.models import Profile
 from .serializers import (
@@ -15,6 +15,9 @@ from .serializers import (
     CustomerUserListSerializer,
 )
 from django.shortcuts import get_object_or_404
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from base_app import conditional
 
 
 class ProfileDetailView(generics.RetrieveUpdateAPIView):
@@ -26,7 +29,7 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
         Retrieve the Profile where the associated user's ID matches the URL parameter.
         """
         user_id = self.kwargs["pk"]
-        obj = get_object_or_404(Profile, user__id=user_id)
+        obj = get_object_or_404(Profile.objects.select_related("user__business_rating"), user__id=user_id)
 
         if self.request.method in ["PATCH", "PUT"]:
             if not self.request.user.is_staff and obj.user != self.request.user:
@@ -34,13 +37,54 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
 
         return obj
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return the profile, or 304 when If-None-Match / If-Modified-Since match the updated_at
+        of the profile and of its rating.
+        """
+        timestamps = (
+            Profile.objects.filter(user__id=kwargs["pk"])
+            .values_list("updated_at", "user__business_rating__updated_at")
+            .first()
+        )
+        if timestamps is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        updated_at = max(timestamp for timestamp in timestamps if timestamp is not None)
+        etag = conditional.make_etag(request, "profile", kwargs["pk"], *timestamps)
+        not_modified = conditional.get_not_modified_response(request, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+        return conditional.set_validators(super().retrieve(request, *args, **kwargs), etag, updated_at)
+
 
 class BusinessUserListView(generics.ListAPIView):
     serializer_class = BusinessUserListSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ["rating", "review_count"]
 
     def get_queryset(self):
-        return Profile.objects.filter(type="business")
+        """
+        Return business profiles with their rating, optionally only those rated at least ?min_rating.
+
+        rating and review_count come from BusinessRating and can be used in ?ordering.
+        """
+        queryset = (
+            Profile.objects.filter(type="business")
+            .select_related("user__business_rating")
+            .annotate(
+                rating=F("user__business_rating__average"),
+                review_count=Coalesce(F("user__business_rating__count"), Value(0)),
+            )
+        )
+        min_rating = self.request.query_params.get("min_rating")
+        if min_rating:
+            try:
+                queryset = queryset.filter(rating__gte=float(min_rating))
+            except ValueError:
+                raise ValidationError({"min_rating": "A number is required."})
+        return queryset
 
 
 class CustomerUserListView(generics.ListAPIView):
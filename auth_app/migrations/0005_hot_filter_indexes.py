@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-17 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_remove_profile_first_name_remove_profile_last_name_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['type'], name='profile_type_idx'),
+        ),
+    ]
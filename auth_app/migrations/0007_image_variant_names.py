@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 04:04
+
+from django.db import migrations, models
+from base_app import thumbnails
+
+
+def record_existing_file_variants(apps, schema_editor):
+    """
+    Record the derivatives that were already generated, checking the storage once per file.
+    """
+    Profile = apps.get_model('auth_app', 'Profile')
+    for instance in Profile.objects.exclude(file='').exclude(file=None).only('id', 'file').iterator():
+        field_file = instance.file
+        names = {variant: thumbnails.get_variant_name(field_file.name, variant) for variant in thumbnails.get_variants()}
+        if all(field_file.storage.exists(name) for name in names.values()):
+            Profile.objects.filter(pk=instance.pk).update(file_variant_names={'source': field_file.name, **names})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0006_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='file_variant_names',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(record_existing_file_variants, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,8 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     name = models.CharField(max_length=255, default="default")
     file = models.FileField(upload_to="uploads/", null=True, blank=True)
+    # Derivatives of file written by base_app.thumbnails, see generate_variants.
+    file_variant_names = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=255, blank=True, default="")
     tel = models.CharField(max_length=20, blank=True, default="")
     description = models.TextField(blank=True, default="")
@@ -18,6 +20,12 @@ class Profile(models.Model):
     type = models.CharField(max_length=10, choices=USER_TYPES, default="customer")
     email = models.EmailField(unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["type"], name="profile_type_idx"),
+        ]
 
     def __str__(self):
         return self.user.username if self.user else "Unbekanntes Profil"
@@ -0,0 +1,35 @@
+from functools import partial
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from auth_app.models import Profile
+from base_app import thumbnails
+
+
+@receiver(post_save, sender=Profile)
+def schedule_profile_file_variants(sender, instance, **kwargs):
+    """
+    Queue thumbnail and card derivatives of a new or changed profile picture.
+
+    params:
+        sender (type): The Profile model class.
+        instance (Profile): The saved profile.
+    """
+    thumbnails.schedule_variants(
+        instance.file, instance.file_variant_names, on_complete=partial(store_profile_file_variants, instance.pk)
+    )
+
+
+def store_profile_file_variants(profile_id, names):
+    """
+    Record generated derivatives on the profile, unless its file was replaced meanwhile.
+
+    updated_at is moved forward so the profile's ETag changes; update() sends no post_save.
+
+    params:
+        profile_id (int): Profile ID.
+        names (dict): Result of thumbnails.generate_variants.
+    """
+    Profile.objects.filter(pk=profile_id, file=names["source"]).update(
+        file_variant_names=names, updated_at=timezone.now()
+    )
@@ -1,3 +1,53 @@
-from django.test import TestCase
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from reviews_app.models import BusinessRating
 
-# Create your tests here.
+
+class ProfileConditionalGetTests(APITestCase):
+    """
+    ETag / Last-Modified revalidation of profile responses.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username="profiled")
+        Profile.objects.create(user=self.user, type="business", email="profiled@example.com")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("profile-detail", args=[self.user.id])
+
+    def test_profile_returns_304_until_it_is_updated(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.patch(self.url, {"location": "Berlin"})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["location"], "Berlin")
+
+    def test_new_review_changes_the_profile_etag(self):
+        customers = []
+        for index in range(2):
+            customer = User.objects.create(username=f"rater{index}")
+            Profile.objects.create(user=customer, type="customer", email=f"rater{index}@example.com")
+            customers.append(customer)
+        data = {"business_user": self.user.id, "rating": 4, "description": "Good"}
+
+        self.client.force_authenticate(customers[0])
+        self.client.post(reverse("reviews-list"), data)
+        etag = self.client.get(self.url)["ETag"]
+
+        self.client.force_authenticate(customers[1])
+        self.client.post(reverse("reviews-list"), {**data, "rating": 2})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rating"]["count"], 2)
+
+        etag = response["ETag"]
+        BusinessRating.objects.filter(business_user=self.user).update(count=5)
+        call_command("rebuild_business_ratings", stdout=StringIO())
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,236 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a unique ordering.
+
+    Each page is fetched with a range condition on the ordering columns of the last row
+    of the previous page instead of OFFSET, and no COUNT(*) is run unless get_count
+    provides one. The ordering must end with a unique column such as "id".
+
+    Attributes:
+        page_size (int): Default number of items per page.
+        page_size_query_param (str): Query parameter name to override page size.
+        max_page_size (int): Maximum allowed number of items per page.
+        cursor_query_param (str): Query parameter carrying the opaque cursor.
+        ordering (tuple): Ordering fields, prefixed with "-" for descending.
+    """
+
+    page_size = 6
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+    ordering = ("-updated_at", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering used for this request.
+
+        return:
+            tuple: Ordering fields, prefixed with "-" for descending.
+        """
+        return self.ordering
+
+    def get_page_size(self, request):
+        """
+        Return the requested page size, bounded by max_page_size.
+
+        params:
+            request (Request): The current request.
+        return:
+            int: Page size for this request.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count(self, queryset):
+        """
+        Return a total count for the response, or None to omit it.
+
+        params:
+            queryset (QuerySet): The filtered, unpaginated queryset.
+        return:
+            int or None: Total number of results.
+        """
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of results after the position encoded in the cursor.
+
+        params:
+            queryset (QuerySet): The filtered queryset.
+            request (Request): The current request.
+            view (APIView): The calling view.
+        return:
+            list: Model instances of the current page.
+        raise:
+            NotFound: If the cursor cannot be decoded.
+        """
+        self.request = request
+        self.fields = self.get_ordering(request, queryset, view)
+        self.count = self.get_count(queryset)
+        page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request, queryset.model)
+        results = self.get_page(queryset, position, page_size + 1)
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_position = self.get_position(results[-1]) if self.has_next else None
+        return results
+
+    def get_page_queryset(self, queryset, position):
+        """
+        Order the queryset by the keyset and restrict it to rows after the position.
+
+        params:
+            queryset (QuerySet): The filtered queryset.
+            position (list or None): Values of the ordering fields, None on the first page.
+        return:
+            QuerySet: Ordered, unsliced queryset of the page and everything after it.
+        raise:
+            NotFound: If the position cannot be used as a filter.
+        """
+        queryset = queryset.order_by(*self.fields)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.get_position_filter(position))
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+        return queryset
+
+    def get_page(self, queryset, position, limit):
+        """
+        Fetch up to limit rows after the position.
+
+        params:
+            queryset (QuerySet): The filtered queryset.
+            position (list or None): Values of the ordering fields, None on the first page.
+            limit (int): Maximum number of rows.
+        return:
+            list: Model instances in keyset order.
+        """
+        return list(self.get_page_queryset(queryset, position)[:limit])
+
+    def get_position(self, instance):
+        """
+        Read the ordering values of an instance.
+
+        params:
+            instance (Model): The last instance of a page.
+        return:
+            list: Values of the ordering fields.
+        """
+        return [getattr(instance, field.lstrip("-")) for field in self.fields]
+
+    def get_position_filter(self, position):
+        """
+        Build the condition selecting rows strictly after the given position.
+
+        The leading field is bounded on its own so the database can use a range scan
+        on an index starting with that column.
+
+        params:
+            position (list): Values of the ordering fields.
+        return:
+            Q: Filter for rows after the position.
+        """
+        names = [field.lstrip("-") for field in self.fields]
+        lookups = ["lt" if field.startswith("-") else "gt" for field in self.fields]
+
+        after = Q()
+        for index, (name, lookup) in enumerate(zip(names, lookups)):
+            equal = {names[i]: position[i] for i in range(index)}
+            after |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+
+        leading_lookup = "lte" if lookups[0] == "lt" else "gte"
+        return Q(**{f"{names[0]}__{leading_lookup}": position[0]}) & after
+
+    def encode_cursor(self, position):
+        """
+        Encode a position as an opaque, URL-safe cursor.
+
+        Datetimes keep their full microsecond precision so that no row is skipped or repeated.
+
+        params:
+            position (list): Values of the ordering fields.
+        return:
+            str: Encoded cursor.
+        """
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in position]
+        payload = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request, model):
+        """
+        Decode the cursor query parameter into typed ordering values.
+
+        params:
+            request (Request): The current request.
+            model (type): Model class of the paginated queryset.
+        return:
+            list or None: Values of the ordering fields, or None on the first page.
+        raise:
+            NotFound: If the cursor is malformed.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            if not isinstance(position, list) or len(position) != len(self.fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(field.lstrip("-")).to_python(value) for field, value in zip(self.fields, position)
+            ]
+            # The ordering fields are not nullable, so None never comes from encode_cursor.
+            if any(value is None for value in position):
+                raise ValueError
+            return position
+        except (TypeError, ValueError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        """
+        Build the absolute URL of the next page.
+
+        return:
+            str or None: URL of the next page, or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        """
+        Wrap a page of serialized data with the next link and optional count.
+
+        params:
+            data (list): Serialized results.
+        return:
+            Response: Paginated response.
+        """
+        payload = OrderedDict()
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["next"] = self.get_next_link()
+        payload["results"] = data
+        return Response(payload)
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from base_app import links
+
+
+class MediaFileField(serializers.FileField):
+    """
+    FileField that renders its URL with base_app.links, without calling storage.url() per file.
+    """
+
+    def to_representation(self, value):
+        """
+        Return the absolute URL of the file, or its relative URL without a request in the context.
+
+        params:
+            value (FieldFile): The stored file.
+        return:
+            str or None: URL of the file, its name if use_url is off, or None if empty.
+        """
+        if not value:
+            return None
+        if not getattr(self, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return value.name
+        return links.get_media_url(value, self.context.get("request"))
@@ -0,0 +1,51 @@
+import time
+from functools import partial
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key):
+    """
+    Read a version number, initializing it from the clock if it is missing.
+
+    Starting from the current time means a version that was evicted never repeats an older
+    value, so stale entries cannot become reachable again.
+
+    params:
+        key (str): Cache key of the version.
+    return:
+        int: Current version.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def _incr_version(key):
+    """
+    Increment a version number, restarting it from the clock if it was evicted.
+
+    params:
+        key (str): Cache key of the version.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_version(key):
+    """
+    Move a version number forward so that all entries keyed on it become unreachable.
+
+    Inside a transaction the version is bumped again on commit, so a response cached by a
+    concurrent request from the not yet committed state does not outlive the write.
+
+    params:
+        key (str): Cache key of the version.
+    """
+    _incr_version(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_incr_version, key))
@@ -0,0 +1,59 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(request, *parts, weak=False):
+    """
+    Build an entity tag from freshness values, without rendering the response.
+
+    The host, path with query string and negotiated renderer are part of the tag, because
+    absolute URLs, options such as ?expand and the media type of the body depend on them.
+
+    params:
+        request (Request): The current request, after content negotiation.
+        parts: Values that change whenever the representation changes, e.g. updated_at.
+        weak (bool): Whether to build a weak tag (W/"...").
+    return:
+        str: Quoted entity tag.
+    """
+    renderer = getattr(request, "accepted_media_type", "")
+    raw = "|".join(str(part) for part in (request.get_host(), request.get_full_path(), renderer, *parts))
+    etag = f'"{hashlib.md5(raw.encode("utf-8")).hexdigest()}"'
+    return f"W/{etag}" if weak else etag
+
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current validators.
+
+    params:
+        request (Request): The current request.
+        etag (str): Current entity tag.
+        last_modified (datetime, optional): Time of the latest change.
+    return:
+        HttpResponse or None: A 304 response carrying the validators, or None if the client copy is stale.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Add ETag, Last-Modified and a Cache-Control header that makes clients revalidate before reuse.
+
+    params:
+        response (HttpResponse): Response to update.
+        etag (str): Entity tag.
+        last_modified (datetime, optional): Time of the latest change.
+    return:
+        HttpResponse: The same response.
+    """
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
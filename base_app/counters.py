@@ -0,0 +1,82 @@
+import operator
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+
+def get_timestamps(model):
+    """
+    Return fresh values for the auto_now fields of a counter model.
+
+    QuerySet.update() and the update part of an upsert skip auto_now, so the counter writes
+    set these explicitly; readers such as the profile ETag rely on them.
+
+    params:
+        model (type): Counter model.
+    return:
+        dict: Name of every auto_now field mapped to the current time.
+    """
+    now = timezone.now()
+    return {field.name: now for field in model._meta.concrete_fields if getattr(field, "auto_now", False)}
+
+
+def update_or_recount(model, lookup, changes, recount, create=True):
+    """
+    Apply F() expression changes to one materialized counter row in a single UPDATE.
+
+    Call after the counted rows themselves were written, in the same transaction. If the row
+    does not exist yet and create is true, it is created from recount(), which already
+    includes the change. auto_now fields such as updated_at are moved forward as well.
+
+    params:
+        model (type): Counter model, unique on the fields in lookup.
+        lookup (dict): Filter selecting the counter row, e.g. {"business_user_id": 1}.
+        changes (dict): Field name mapped to its new value, usually an F() expression.
+        recount (callable): Returns the values of a new row, counted from the source tables.
+        create (bool): Whether a missing row should be created; false when the change only
+            removes something, since a missing row then already counts nothing.
+    """
+    changes = {**changes, **get_timestamps(model)}
+    if model.objects.filter(**lookup).update(**changes) or not create:
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **recount())
+    except IntegrityError:
+        # A concurrent writer created the row first; its recount did not include this change.
+        model.objects.filter(**lookup).update(**changes)
+
+
+def replace_all(queryset, key, expected, empty, same=operator.eq):
+    """
+    Write recomputed counter rows in one transaction: upsert the expected rows and reset the
+    rows of the queryset that no longer count anything. auto_now fields are written too.
+
+    params:
+        queryset (QuerySet): Counter rows covered by the rebuild.
+        key (str): Name of the unique foreign key of the counter model, e.g. "business_user".
+        expected (dict): Key value mapped to the recomputed values of its row.
+        empty (dict): Values of a row that counts nothing.
+        same (callable): Compares recomputed values with stored values, or None without a row.
+    return:
+        tuple: (number of rows written, number of rows that were out of sync)
+    """
+    model = queryset.model
+    column = model._meta.get_field(key).attname
+    fields = list(empty)
+    with transaction.atomic():
+        current = {row.pop(column): row for row in queryset.select_for_update().values(column, *fields)}
+        out_of_sync = [
+            key_value
+            for key_value in expected.keys() | current.keys()
+            if not same(expected.get(key_value, empty), current.get(key_value))
+        ]
+
+        queryset.exclude(**{f"{column}__in": expected.keys()}).update(**empty, **get_timestamps(model))
+        model.objects.bulk_create(
+            [model(**{column: key_value}, **values) for key_value, values in expected.items()],
+            update_conflicts=True,
+            unique_fields=[key],
+            update_fields=[*fields, *get_timestamps(model)],
+        )
+    return len(expected.keys() | current.keys()), len(out_of_sync)
@@ -0,0 +1,116 @@
+from django.core.files.storage import FileSystemStorage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils.encoding import filepath_to_uri
+
+PLACEHOLDER = "9182736450"
+
+_templates = []
+
+
+class URLTemplate:
+    """
+    URL of a named route with a single argument, resolved once and then filled by string formatting.
+
+    The route is reversed with a placeholder argument on first use and split around it, so
+    building a link costs one f-string instead of a resolver walk.
+
+    Attributes:
+        viewname (str): Name of the route, e.g. "offerdetails-detail".
+        remove (str): Substring removed from the resolved URL, e.g. "/api".
+    """
+
+    def __init__(self, viewname, remove=""):
+        self.viewname = viewname
+        self.remove = remove
+        self._parts = None
+        _templates.append(self)
+
+    def resolve(self):
+        """
+        Reverse the route with the placeholder and store the text around it.
+
+        return:
+            tuple: (prefix, suffix) of the URL.
+        """
+        url = reverse(self.viewname, args=[PLACEHOLDER])
+        if self.remove:
+            url = url.replace(self.remove, "")
+        prefix, _, suffix = url.partition(PLACEHOLDER)
+        self._parts = (prefix, suffix)
+        return self._parts
+
+    def format(self, value):
+        """
+        Build the URL for one argument.
+
+        params:
+            value (int or str): Route argument, usually a primary key.
+        return:
+            str: URL path, equal to reverse(viewname, args=[value]) minus `remove`.
+        """
+        prefix, suffix = self._parts or self.resolve()
+        return f"{prefix}{value}{suffix}"
+
+    def reset(self):
+        """
+        Forget the resolved route so the next call resolves it again.
+        """
+        self._parts = None
+
+
+@receiver(setting_changed)
+def reset_templates(setting, **kwargs):
+    """
+    Re-resolve all URL templates when the URLconf changes, e.g. under override_settings in tests.
+    """
+    if setting == "ROOT_URLCONF":
+        for template in _templates:
+            template.reset()
+
+
+def _get_absolute_base(request, base_url):
+    """
+    Return the absolute form of a storage base URL, computed once per request.
+
+    params:
+        request (HttpRequest): The current request.
+        base_url (str): Base URL of a storage, e.g. "/media/".
+    return:
+        str: Absolute base URL.
+    """
+    bases = getattr(request, "_media_base_urls", None)
+    if bases is None:
+        bases = {}
+        request._media_base_urls = bases
+    if base_url not in bases:
+        bases[base_url] = request.build_absolute_uri(base_url)
+    return bases[base_url]
+
+
+def get_media_url(field_file, request, name=None):
+    """
+    Build the URL of a stored file, absolute when a request is given.
+
+    For FileSystemStorage the URL is joined from the storage base URL, made absolute once per
+    request; other storages fall back to storage.url() and request.build_absolute_uri().
+
+    params:
+        field_file (FieldFile): The stored file.
+        request (HttpRequest, optional): Request used to build absolute URLs.
+        name (str, optional): Storage name of a related file in the same storage, e.g. a derivative.
+    return:
+        str: URL of the file.
+    """
+    storage = field_file.storage
+    name = name or field_file.name
+    if not isinstance(storage, FileSystemStorage):
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    path = filepath_to_uri(name).lstrip("/")
+    base_url = storage.base_url
+    if request is None:
+        return f"{base_url}{path}"
+    return f"{_get_absolute_base(request, base_url)}{path}"
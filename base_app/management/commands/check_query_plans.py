@@ -0,0 +1,226 @@
+import re
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Avg, Max, Min, Q
+from django.test.utils import CaptureQueriesContext
+from auth_app.models import Profile
+from offers_app.facets import get_facets
+from offers_app.models import Offer, OfferDetails
+from orders_app import events, export, stats
+from orders_app.api.pagination import OrderCursorPagination
+from orders_app.models import ArchivedOrder, Order
+from reviews_app import ratings
+from reviews_app.api.pagination import ReviewCursorPagination
+from reviews_app.models import Review
+
+SAMPLE_ID = 1
+PAGE_SIZE = 6
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)\S+(?: AS \S+)?$")
+INDEX_SCAN = re.compile(r"^SCAN \S+(?: AS \S+)? USING (?:COVERING )?INDEX ")
+
+# Queries that may walk a whole index, and why that is bounded or intended.
+ALLOWED_INDEX_SCANS = {
+    "offers list": "walks offer_updated_id_idx in list order and stops after one page",
+    "reviews list": "walks review_updated_idx in list order and stops after one page",
+    "reviews ordered by rating": "walks review_rating_idx in list order and stops after one page",
+    "offers list count": "counts every offer from the smallest covering index",
+    "base info offer count": "counts every offer from the smallest covering index",
+    "base info review count": "counts every review from the smallest covering index",
+    "base info average rating": "averages every rating from review_rating_idx without reading the table",
+}
+
+
+def get_order_page(queryset, position=None):
+    """
+    Fetch one page of orders the way OrderViewSet.list does for the sample user.
+
+    params:
+        queryset (QuerySet): Filtered orders of the sample user.
+        position (list, optional): Keyset position of a following page.
+    return:
+        list: Orders of the page.
+    """
+    pagination = OrderCursorPagination()
+    pagination.request = SimpleNamespace(user=SimpleNamespace(id=SAMPLE_ID))
+    pagination.fields = pagination.ordering
+    return pagination.get_page(queryset, position, PAGE_SIZE + 1)
+
+
+def get_review_page(queryset, ordering, position=None):
+    """
+    Fetch one page of reviews the way ReviewViewSet.list does.
+
+    params:
+        queryset (QuerySet): Filtered reviews.
+        ordering (str): Value of ?ordering.
+        position (list, optional): Keyset position of a following page.
+    return:
+        list: Reviews of the page.
+    """
+    pagination = ReviewCursorPagination()
+    pagination.fields = pagination.orderings[ordering]
+    return pagination.get_page(queryset, position, PAGE_SIZE + 1)
+
+
+def get_endpoint_queries():
+    """
+    Return the main queries of the API endpoints as callables that execute them.
+
+    Each callable mirrors the query its view runs, with sample ids and filter values.
+
+    return:
+        list of tuple: (name, callable)
+    """
+    offers = Offer.objects.select_related("user")
+    order_users = Q(customer_user=SAMPLE_ID) | Q(business_user=SAMPLE_ID)
+    reviews_of_business = Review.objects.filter(business_user_id=SAMPLE_ID)
+    return [
+        ("offers list", lambda: list(offers.order_by("-updated_at")[:PAGE_SIZE])),
+        ("offers list count", lambda: Offer.objects.count()),
+        ("offers list by creator", lambda: list(offers.filter(user_id=SAMPLE_ID)[:PAGE_SIZE])),
+        ("offers list by min_price", lambda: list(offers.filter(min_price__gte=100)[:PAGE_SIZE])),
+        ("offers list by max_delivery_time", lambda: list(offers.filter(min_delivery_time__lte=3)[:PAGE_SIZE])),
+        ("offers list by updated_at", lambda: list(offers.filter(updated_at__gte=SINCE)[:PAGE_SIZE])),
+        ("offers list by detail price", lambda: list(offers.filter(offer_details__price__gte=100)[:PAGE_SIZE])),
+        (
+            "offers list by detail delivery time",
+            lambda: list(offers.filter(offer_details__delivery_time_in_days__lte=3)[:PAGE_SIZE]),
+        ),
+        ("offer facets", lambda: get_facets(Offer.objects.filter(min_price__gte=100))),
+        ("offer retrieve", lambda: list(offers.filter(pk=SAMPLE_ID))),
+        (
+            "offer freshness",
+            lambda: Offer.objects.filter(pk=SAMPLE_ID)
+            .values("updated_at")
+            .annotate(details_updated_at=Max("offer_details__updated_at"))
+            .order_by("updated_at")
+            .first(),
+        ),
+        (
+            "offer details freshness",
+            lambda: OfferDetails.objects.filter(pk=SAMPLE_ID).values_list("updated_at", flat=True).first(),
+        ),
+        ("offer details prefetch", lambda: list(OfferDetails.objects.filter(offer_id__in=[SAMPLE_ID]))),
+        ("offer details retrieve", lambda: list(OfferDetails.objects.filter(pk=SAMPLE_ID))),
+        (
+            "offer minimums",
+            lambda: OfferDetails.objects.filter(offer_id=SAMPLE_ID).aggregate(
+                Min("price"), Min("delivery_time_in_days")
+            ),
+        ),
+        ("orders list", lambda: get_order_page(Order.objects.filter(order_users))),
+        ("orders list next page", lambda: get_order_page(Order.objects.filter(order_users), [SINCE, SAMPLE_ID])),
+        (
+            "orders list by status and date",
+            lambda: get_order_page(Order.objects.filter(order_users, status="completed", created_at__gte=SINCE)),
+        ),
+        ("order retrieve", lambda: list(Order.objects.filter(order_users, pk=SAMPLE_ID))),
+        ("orders export", lambda: list(export.get_rows(SAMPLE_ID))),
+        ("orders export by status and date", lambda: list(export.get_rows(SAMPLE_ID, "completed", SINCE, SINCE))),
+        ("order events feed", lambda: events.get_events(SAMPLE_ID, SAMPLE_ID)),
+        ("latest order event", events.get_latest_id),
+        ("archived orders list", lambda: get_order_page(ArchivedOrder.objects.filter(order_users))),
+        ("order count", lambda: stats.get_count(SAMPLE_ID, "in_progress")),
+        ("completed order count", lambda: stats.get_count(SAMPLE_ID, "completed")),
+        ("order stats recount", lambda: stats.count_orders(SAMPLE_ID)),
+        ("order summary", lambda: stats.get_summary(SAMPLE_ID)),
+        ("reviews list", lambda: get_review_page(Review.objects.all(), "-updated_at")),
+        ("reviews list next page", lambda: get_review_page(Review.objects.all(), "-updated_at", [SINCE, SAMPLE_ID])),
+        ("reviews by business user", lambda: get_review_page(reviews_of_business, "-updated_at")),
+        ("reviews by business user next page", lambda: get_review_page(reviews_of_business, "updated_at", [SINCE, 1])),
+        ("reviews by reviewer", lambda: get_review_page(Review.objects.filter(reviewer_id=SAMPLE_ID), "-updated_at")),
+        ("reviews ordered by rating", lambda: get_review_page(Review.objects.all(), "-rating")),
+        (
+            "reviews by business user with min rating",
+            lambda: get_review_page(reviews_of_business.filter(rating__gte=4), "-rating", [5.0, SAMPLE_ID]),
+        ),
+        (
+            "reviews by business user and reviewer",
+            lambda: list(Review.objects.filter(reviewer_id=SAMPLE_ID, business_user_id=SAMPLE_ID)),
+        ),
+        (
+            "business profiles",
+            lambda: list(
+                Profile.objects.filter(type="business", user__business_rating__average__gte=4)
+                .select_related("user__business_rating")
+                .order_by("-user__business_rating__average")
+            ),
+        ),
+        ("customer profiles", lambda: list(Profile.objects.filter(type="customer"))),
+        (
+            "profile retrieve",
+            lambda: list(Profile.objects.filter(user__id=SAMPLE_ID).select_related("user__business_rating")),
+        ),
+        (
+            "profile freshness",
+            lambda: Profile.objects.filter(user__id=SAMPLE_ID)
+            .values_list("updated_at", "user__business_rating__updated_at")
+            .first(),
+        ),
+        ("business rating recount", lambda: ratings.count_ratings(SAMPLE_ID)),
+        ("base info review count", lambda: Review.objects.count()),
+        ("base info average rating", lambda: Review.objects.aggregate(Avg("rating"))),
+        ("base info business profile count", lambda: Profile.objects.filter(type="business").count()),
+        ("base info offer count", lambda: Offer.objects.count()),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN QUERY PLAN on the main query of every endpoint and fail on full table scans
+    and on index scans that are not listed in ALLOWED_INDEX_SCANS.
+    """
+
+    help = "Check that no endpoint query falls back to a table or unbounded index scan (SQLite only)."
+
+    def handle(self, *args, **options):
+        """
+        Execute each endpoint query, explain the SQL it ran and report table and index scans.
+
+        params:
+            options (dict): Parsed command line options.
+        raise:
+            CommandError: If the database is not SQLite or any query performs a table scan or
+                an index scan that is not allowed.
+        """
+        if connection.vendor != "sqlite":
+            raise CommandError("check_query_plans only supports SQLite.")
+
+        failures = []
+        for name, run_query in get_endpoint_queries():
+            with CaptureQueriesContext(connection) as captured:
+                run_query()
+
+            for query in captured.captured_queries:
+                plan = self.explain(query["sql"])
+                scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+                if name not in ALLOWED_INDEX_SCANS:
+                    scans += [detail for detail in plan if INDEX_SCAN.match(detail)]
+                if scans:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"SCAN       {name}: {'; '.join(scans)}"))
+                else:
+                    self.stdout.write(f"ok         {name}")
+                if options["verbosity"] > 1:
+                    for detail in plan:
+                        self.stdout.write(f"             {detail}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint queries fall back to a table or index scan.")
+        self.stdout.write(self.style.SUCCESS("All endpoint queries use indexes."))
+
+    def explain(self, sql):
+        """
+        Return the EXPLAIN QUERY PLAN details of a statement.
+
+        params:
+            sql (str): Executed SQL with parameters already inlined.
+        return:
+            list of str: Plan detail lines.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
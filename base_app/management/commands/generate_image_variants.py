@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from auth_app.models import Profile
+from auth_app.signals import store_profile_file_variants
+from base_app import thumbnails
+from offers_app.models import Offer
+from offers_app.signals import store_offer_image_variants
+
+
+class Command(BaseCommand):
+    """
+    Generate missing thumbnail and card derivatives for existing uploads.
+    """
+
+    help = "Generate image derivatives for Offer.image and Profile.file synchronously."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate derivatives that already exist.")
+
+    def handle(self, *args, **options):
+        """
+        Render derivatives for every offer image and profile file whose derivatives are not recorded.
+
+        params:
+            options (dict): Parsed command line options.
+        """
+        generated = 0
+        offers = Offer.objects.exclude(image="").exclude(image=None).only("id", "image", "image_variant_names")
+        for offer in offers.iterator():
+            if options["force"] or not thumbnails.is_ready(offer.image, offer.image_variant_names):
+                store_offer_image_variants(offer.pk, thumbnails.generate_variants(offer.image))
+                generated += 1
+
+        profiles = Profile.objects.exclude(file="").exclude(file=None).only("id", "file", "file_variant_names")
+        for profile in profiles.iterator():
+            if options["force"] or not thumbnails.is_ready(profile.file, profile.file_variant_names):
+                store_profile_file_variants(profile.pk, thumbnails.generate_variants(profile.file))
+                generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Generated derivatives for {generated} files."))
@@ -1,3 +1,82 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F, QuerySet
 from django.test import TestCase
+from base_app import counters
+from orders_app.models import OrderStats
+from reviews_app.models import Review
 
-# Create your tests here.
+
+class CounterTests(TestCase):
+    """
+    Shared write path of the materialized counters.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username="counter")
+        self.lookup = {"business_user_id": self.user.id}
+
+    def test_missing_row_is_created_from_the_recount(self):
+        counters.update_or_recount(OrderStats, self.lookup, {"completed": F("completed") + 1}, lambda: {"completed": 4})
+        self.assertEqual(OrderStats.objects.get(**self.lookup).completed, 4)
+
+        counters.update_or_recount(OrderStats, self.lookup, {"completed": F("completed") + 1}, dict)
+        self.assertEqual(OrderStats.objects.get(**self.lookup).completed, 5)
+
+    def test_concurrently_created_row_still_gets_the_change(self):
+        OrderStats.objects.create(**self.lookup, completed=2)
+        update = QuerySet.update
+        updates = []
+
+        def update_after_concurrent_insert(queryset, **changes):
+            # The first UPDATE ran before the concurrent writer inserted the row.
+            updates.append(changes)
+            return update(queryset, **changes) if len(updates) > 1 else 0
+
+        with mock.patch.object(QuerySet, "update", autospec=True, side_effect=update_after_concurrent_insert):
+            counters.update_or_recount(OrderStats, self.lookup, {"completed": F("completed") + 1}, dict)
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(OrderStats.objects.get(**self.lookup).completed, 3)
+
+    def test_removals_do_not_create_rows(self):
+        counters.update_or_recount(OrderStats, self.lookup, {"completed": F("completed") - 1}, dict, create=False)
+        self.assertFalse(OrderStats.objects.exists())
+
+    def test_replace_all_upserts_resets_and_reports_drift(self):
+        other = User.objects.create(username="stale")
+        OrderStats.objects.create(**self.lookup, completed=1)
+        OrderStats.objects.create(business_user=other, completed=7)
+
+        empty = {"in_progress": 0, "completed": 0, "cancelled": 0}
+        expected = {self.user.id: {**empty, "completed": 1}}
+        self.assertEqual(counters.replace_all(OrderStats.objects.all(), "business_user", expected, empty), (2, 1))
+        self.assertEqual(OrderStats.objects.get(business_user=other).completed, 0)
+        self.assertEqual(OrderStats.objects.get(**self.lookup).completed, 1)
+
+
+class CheckQueryPlansTests(TestCase):
+    """
+    EXPLAIN QUERY PLAN check of the endpoint queries.
+    """
+
+    def test_endpoint_queries_pass(self):
+        output = StringIO()
+        call_command("check_query_plans", stdout=output)
+        self.assertIn("All endpoint queries use indexes.", output.getvalue())
+
+    def test_table_and_unbounded_index_scans_are_reported(self):
+        queries = [
+            ("reviews by description", lambda: list(Review.objects.filter(description="Fine"))),
+            ("all reviews by date", lambda: list(Review.objects.order_by("-updated_at"))),
+            ("review retrieve", lambda: list(Review.objects.filter(pk=1))),
+        ]
+        output = StringIO()
+        with mock.patch("base_app.management.commands.check_query_plans.get_endpoint_queries", return_value=queries):
+            with self.assertRaisesMessage(CommandError, "2 endpoint queries"):
+                call_command("check_query_plans", stdout=output)
+        self.assertIn("SCAN       reviews by description: SCAN reviews_app_review", output.getvalue())
+        self.assertIn("USING INDEX review_updated_idx", output.getvalue())
+        self.assertIn("ok         review retrieve", output.getvalue())
@@ -0,0 +1,194 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+from base_app import links
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANTS = {
+    "thumbnail": (200, 200),
+    "card": (600, 400),
+}
+
+_executor = None
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def get_variants():
+    """
+    Return the configured derivative sizes.
+
+    return:
+        dict: Variant name mapped to (width, height), from settings.IMAGE_VARIANTS.
+    """
+    return getattr(settings, "IMAGE_VARIANTS", DEFAULT_VARIANTS)
+
+
+def get_format():
+    """
+    Return the image format of the derivatives, WebP when Pillow supports it and JPEG otherwise.
+
+    return:
+        str: Pillow format name.
+    """
+    image_format = getattr(settings, "IMAGE_VARIANT_FORMAT", "WEBP").upper()
+    if image_format == "WEBP" and not features.check("webp"):
+        return "JPEG"
+    return image_format
+
+
+def get_variant_name(name, variant):
+    """
+    Build the storage name of a derivative, stored next to the original.
+
+    params:
+        name (str): Storage name of the original file.
+        variant (str): Variant name, e.g. "thumbnail".
+    return:
+        str: Storage name of the derivative.
+    """
+    base, _ = os.path.splitext(name)
+    extension = "jpg" if get_format() == "JPEG" else get_format().lower()
+    return f"{base}_{variant}.{extension}"
+
+
+def generate_variants(field_file):
+    """
+    Render all derivatives of an uploaded image and save them in its storage.
+
+    Files that Pillow cannot read, such as PDFs, are skipped.
+
+    params:
+        field_file (FieldFile): The uploaded original.
+    return:
+        dict: "source" (name of the original) plus variant name mapped to the storage name
+            of its derivative; only "source" for unreadable files.
+    """
+    storage = field_file.storage
+    image_format = get_format()
+    names = {"source": field_file.name}
+    try:
+        with storage.open(field_file.name, "rb") as original:
+            image = ImageOps.exif_transpose(Image.open(original))
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError, OSError):
+        logger.info("Skipping image variants for %s: not a readable image.", field_file.name)
+        return names
+
+    if image_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    for variant, size in get_variants().items():
+        buffer = BytesIO()
+        ImageOps.fit(image, size, Image.Resampling.LANCZOS).save(buffer, format=image_format, quality=85)
+        name = get_variant_name(field_file.name, variant)
+        if storage.exists(name):
+            storage.delete(name)
+        names[variant] = storage.save(name, ContentFile(buffer.getvalue()))
+    return names
+
+
+def _run(field_file, on_complete):
+    """
+    Worker entry point: generate the derivatives and pass their names to on_complete, logging any failure.
+
+    The worker threads are not request threads, so their database connections are closed
+    here instead of by the request_finished handler.
+
+    params:
+        field_file (FieldFile): The uploaded original.
+        on_complete (callable, optional): Called with the result of generate_variants.
+    """
+    close_old_connections()
+    try:
+        names = generate_variants(field_file)
+        if on_complete:
+            on_complete(names)
+    except Exception:
+        logger.exception("Generating image variants for %s failed.", field_file.name)
+    finally:
+        with _pending_lock:
+            _pending.discard(field_file.name)
+        connections.close_all()
+
+
+def get_executor():
+    """
+    Return the shared worker pool, created on first use.
+
+    return:
+        ThreadPoolExecutor: Pool sized by settings.IMAGE_VARIANT_WORKERS.
+    """
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, "IMAGE_VARIANT_WORKERS", 2)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-variants")
+    return _executor
+
+
+def is_ready(field_file, variant_names):
+    """
+    Tell whether the recorded derivatives belong to the current file.
+
+    params:
+        field_file (FieldFile): The uploaded original.
+        variant_names (dict): Result of generate_variants stored on the model.
+    return:
+        bool: True if the derivatives of this very file were generated.
+    """
+    return bool(field_file) and (variant_names or {}).get("source") == field_file.name
+
+
+def schedule_variants(field_file, variant_names, on_complete=None):
+    """
+    Queue derivative generation for an upload once the current transaction commits.
+
+    Nothing is queued if the file is empty, its derivatives are already recorded in
+    variant_names, or the same file is already queued, so saves that keep the file cost
+    no storage access.
+
+    params:
+        field_file (FieldFile): The uploaded original.
+        variant_names (dict): Derivatives recorded on the model, see generate_variants.
+        on_complete (callable, optional): Called in the worker with the result of generate_variants,
+            to record it on the model.
+    """
+    if not field_file or is_ready(field_file, variant_names):
+        return
+
+    def submit():
+        with _pending_lock:
+            if field_file.name in _pending:
+                return
+            _pending.add(field_file.name)
+        get_executor().submit(_run, field_file, on_complete)
+
+    transaction.on_commit(submit)
+
+
+def get_variant_urls(field_file, request, variant_names):
+    """
+    Return absolute URLs of all derivatives, using the original URL until they are recorded.
+
+    The names come from the model, so no storage is accessed.
+
+    params:
+        field_file (FieldFile): The uploaded original.
+        request (HttpRequest): Request used to build absolute URLs.
+        variant_names (dict): Derivatives recorded on the model, see generate_variants.
+    return:
+        dict or None: Variant name mapped to URL, or None without a file or request.
+    """
+    if not field_file or not request:
+        return None
+    ready = variant_names if is_ready(field_file, variant_names) else {}
+    return {variant: links.get_media_url(field_file, request, ready.get(variant)) for variant in get_variants()}
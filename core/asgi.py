@@ -2,6 +2,7 @@
 ASGI config for codeer project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project through it to use the order event stream (/api/order-events/stream/).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
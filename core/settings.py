@@ -103,6 +103,46 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory works out of the box; switch to
+# "django.core.cache.backends.filebased.FileBasedCache" with a LOCATION directory
+# to share cached responses between worker processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "codeer",
+    }
+}
+
+# Lifetime of cached offer list and detail responses in seconds.
+OFFERS_CACHE_TIMEOUT = 300
+
+# Lifetime of cached order summaries (/api/order-stats/<id>/) in seconds.
+ORDERS_CACHE_TIMEOUT = 300
+
+# Default age in days after which archive_orders moves completed and cancelled orders to ArchivedOrder.
+ORDERS_ARCHIVE_AFTER_DAYS = 180
+
+# Order event feeds: seconds between checks for new events, lifetime of one event stream
+# connection (clients reconnect with Last-Event-ID) and maximum wait of a long-poll request.
+ORDER_EVENTS_POLL_INTERVAL = 1.0
+ORDER_EVENTS_STREAM_TIMEOUT = 300
+ORDER_EVENTS_LONG_POLL_TIMEOUT = 25
+# Threads that run the database queries of all open event streams.
+ORDER_EVENTS_STREAM_WORKERS = 4
+
+
+# Image derivatives generated in a background thread pool for Offer.image and Profile.file.
+IMAGE_VARIANTS = {
+    "thumbnail": (200, 200),
+    "card": (600, 400),
+}
+IMAGE_VARIANT_FORMAT = "WEBP"
+IMAGE_VARIANT_WORKERS = 2
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,44 @@
+from rest_framework import filters
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from offers_app import search
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Search filter that serves ?search= from the FTS5 index, ranked by bm25.
+
+    Falls back to the default icontains search over search_fields when the index is not available.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Restrict the queryset to offers matching all search terms, best matches first.
+
+        params:
+            request (Request): The current request.
+            queryset (QuerySet): Offers to filter.
+            view (APIView): The calling view.
+        return:
+            QuerySet: Matching offers ordered by rank, then by most recent update.
+        """
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        if not search.fts_available(connections[queryset.db]):
+            return super().filter_queryset(request, queryset, view)
+
+        match = search.build_match_query(terms)
+        table = search.FTS_TABLE
+        offer_table = queryset.model._meta.db_table
+        return (
+            queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,)))
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT bm25({table}) FROM {table} WHERE {table} MATCH %s AND rowid = {offer_table}.id",
+                    (match,),
+                )
+            )
+            .order_by("search_rank", "-updated_at")
+        )
@@ -1,4 +1,9 @@
+import hashlib
+from django.core.cache import cache
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from base_app.api.pagination import KeysetPagination
+from offers_app import cache as offer_cache
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -14,3 +19,55 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for the offer catalogue on (updated_at, id), newest first.
+
+    The keyset is the only order a cursor can follow: ?search still filters the offers but
+    its ranking is replaced by the keyset, and any other ?ordering is rejected. The total
+    count is cached per filter combination and catalog version, so it is recomputed after
+    any offer write.
+    """
+
+    ordering = ("-updated_at", "-id")
+    ordering_query_param = "ordering"
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the keyset, rejecting an ?ordering it cannot follow.
+
+        params:
+            request (Request): The current request.
+            queryset (QuerySet): The filtered queryset.
+            view (APIView): The calling view.
+        return:
+            tuple: Ordering fields, prefixed with "-" for descending.
+        raise:
+            ValidationError: If ?ordering is anything but -updated_at.
+        """
+        ordering = request.query_params.get(self.ordering_query_param)
+        if ordering and ordering != self.ordering[0]:
+            raise ValidationError(
+                {"ordering": "Cursor pagination always orders by -updated_at; use page numbers for other orderings."}
+            )
+        return self.ordering
+
+    def get_count(self, queryset):
+        """
+        Return the cached number of offers matching the filters, counting on a cache miss.
+
+        params:
+            queryset (QuerySet): The filtered, unpaginated queryset.
+        return:
+            int: Cached or freshly computed total.
+        """
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.md5(f"{sql}{params}".encode("utf-8")).hexdigest()
+        key = f"offers:count:{offer_cache.get_catalog_version()}:{digest}"
+        count = cache.get(key)
+        if count is None:
+            count = queryset.order_by().count()
+            cache.set(key, count, offer_cache.get_timeout())
+        return count
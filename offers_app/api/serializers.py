@@ -1,8 +1,38 @@
 from rest_framework import serializers
 from offers_app.models import Offer, OfferDetails
-from django.db.models import Min
-from django.urls import reverse
+from offers_app import cache as offer_cache
+from base_app import links, thumbnails
+from base_app.api.serializer import MediaFileField
 from rest_framework.exceptions import ValidationError
+from django.utils import timezone
+
+
+REQUIRED_OFFER_TYPES = {"basic", "standard", "premium"}
+
+OFFER_DETAIL_URL = links.URLTemplate("offerdetails-detail", remove="/api")
+
+
+def validate_details_data(details_data, require_all_types):
+    """
+    Validate the raw 'details' payload of an offer.
+
+    params:
+        details_data (list of dict): Details as sent by the client.
+        require_all_types (bool): Whether 'basic', 'standard' and 'premium' must all be present.
+    raise:
+        ValidationError: If any detail is missing 'offer_type' or required types are missing.
+    """
+    if not details_data:
+        return
+
+    for detail in details_data:
+        if "offer_type" not in detail:
+            raise ValidationError({"details": "Each offer detail must include an 'offer_type' field."})
+
+    if require_all_types:
+        existing_types = {detail.get("offer_type") for detail in details_data}
+        if not REQUIRED_OFFER_TYPES.issubset(existing_types):
+            raise ValidationError({"details": "Offers must include 'basic', 'standard', and 'premium' offer types."})
 
 
 class OfferDetailsSerializer(serializers.ModelSerializer):
@@ -50,8 +80,7 @@ class OfferDetailsGETSerializer(serializers.ModelSerializer):
         return:
             str: URL string for the OfferDetails.
         """
-        url = reverse("offerdetails-detail", args=[obj.id])
-        return url.replace("/api", "")
+        return OFFER_DETAIL_URL.format(obj.id)
 
 
 class OfferSerializer(serializers.ModelSerializer):
@@ -70,7 +99,8 @@ class OfferSerializer(serializers.ModelSerializer):
     user_details = serializers.SerializerMethodField()
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
-    image = serializers.FileField(required=False, allow_null=True)
+    image = MediaFileField(required=False, allow_null=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -79,6 +109,7 @@ class OfferSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_variants",
             "description",
             "created_at",
             "updated_at",
@@ -126,22 +157,7 @@ class OfferSerializer(serializers.ModelSerializer):
         """
         request = self.context.get("request")
         details_data = self.initial_data.get("details", [])
-
-        if not details_data:
-            return data
-
-        for detail in details_data:
-            if "offer_type" not in detail:
-                raise ValidationError({"details": "Each offer detail must include an 'offer_type' field."})
-
-        if request.method in ["POST", "PUT"]:
-            required_types = {"basic", "standard", "premium"}
-            existing_types = {detail.get("offer_type") for detail in details_data}
-            if not required_types.issubset(existing_types):
-                raise ValidationError(
-                    {"details": "Offers must include 'basic', 'standard', and 'premium' offer types."}
-                )
-
+        validate_details_data(details_data, require_all_types=request is None or request.method in ["POST", "PUT"])
         return data
 
     def create(self, validated_data):
@@ -163,6 +179,8 @@ class OfferSerializer(serializers.ModelSerializer):
 
         offer_details = [OfferDetails(offer=offer, **detail_data) for detail_data in details_data]
         OfferDetails.objects.bulk_create(offer_details)
+        offer.refresh_min_values(offer_details)
+        offer_cache.bump_offer_version(offer.pk)
 
         return offer
 
@@ -170,11 +188,16 @@ class OfferSerializer(serializers.ModelSerializer):
         """
         Update Offer instance and optionally its OfferDetails.
 
+        Detail changes are validated per offer_type against the details already loaded on the
+        instance and written with a single bulk_update. Call inside a transaction.
+
         params:
             instance (Offer): Offer instance to update.
             validated_data (dict): Validated data from the request.
         return:
             Offer: Updated Offer instance.
+        raise:
+            ValidationError: If a detail is invalid or its offer_type does not exist for this offer.
         """
         details_data = self.initial_data.get("details", None)
 
@@ -182,18 +205,32 @@ class OfferSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
-        if details_data is not None:
+        if details_data:
             existing_details = {detail.offer_type: detail for detail in instance.offer_details.all()}
+            changed_details = []
+            changed_fields = set()
 
             for detail_data in details_data:
                 offer_type = detail_data.get("offer_type")
-                if offer_type in existing_details:
-                    detail_instance = existing_details[offer_type]
-                    for attr, value in detail_data.items():
-                        setattr(detail_instance, attr, value)
-                    detail_instance.save()
-                else:
-                    OfferDetails.objects.create(offer=instance, **detail_data)
+                if offer_type not in existing_details:
+                    raise ValidationError({"detail": f"Offer type '{offer_type}' does not exist for this offer."})
+
+                detail_instance = existing_details[offer_type]
+                detail_serializer = OfferDetailsSerializer(detail_instance, data=detail_data, partial=True)
+                detail_serializer.is_valid(raise_exception=True)
+                for attr, value in detail_serializer.validated_data.items():
+                    setattr(detail_instance, attr, value)
+                changed_fields.update(detail_serializer.validated_data)
+                changed_details.append(detail_instance)
+
+            if changed_fields:
+                now = timezone.now()
+                for detail_instance in changed_details:
+                    detail_instance.updated_at = now
+                changed_fields.add("updated_at")
+                OfferDetails.objects.bulk_update(changed_details, sorted(changed_fields))
+                instance.refresh_min_values(existing_details.values())
+                offer_cache.bump_offer_version(instance.pk)
 
         return instance
 
@@ -201,17 +238,39 @@ class OfferSerializer(serializers.ModelSerializer):
         """
         Provide different serializers for details depending on request method.
 
+        GET requests with ?expand=details embed the full details instead of links.
+
+        The details serializer is built once and reused for every offer of a list, since
+        building its fields costs more than rendering three details.
+
         params:
             obj (Offer): Offer instance.
         return:
             list: Serialized OfferDetails data (full or minimal based on request).
         """
-        request = self.context.get("request")
+        details_serializer = getattr(self, "_details_serializer", None)
+        if details_serializer is None:
+            request = self.context.get("request")
+            if request and request.method in ["POST", "PUT"] or self.expands_details():
+                details_serializer = OfferDetailsSerializer(many=True)
+            else:
+                details_serializer = OfferDetailsGETSerializer(many=True)
+            self._details_serializer = details_serializer
 
-        if request and request.method in ["POST", "PUT"]:
-            return OfferDetailsSerializer(obj.offer_details.all(), many=True).data
+        return details_serializer.to_representation(obj.offer_details.all())
 
-        return OfferDetailsGETSerializer(obj.offer_details.all(), many=True).data
+    def expands_details(self):
+        """
+        Check whether the request asks for full details inline with ?expand=details.
+
+        return:
+            bool: True if "details" is one of the comma-separated expand values.
+        """
+        request = self.context.get("request")
+        query_params = getattr(request, "query_params", None)
+        if not query_params:
+            return False
+        return "details" in query_params.get("expand", "").split(",")
 
     def get_user_details(self, obj):
         """
@@ -230,38 +289,33 @@ class OfferSerializer(serializers.ModelSerializer):
 
     def get_min_price(self, obj):
         """
-        Compute minimum price from related OfferDetails.
+        Return the stored minimum price of the related OfferDetails.
 
         params:
             obj (Offer): Offer instance.
         return:
             float: Minimum price or 0.00 if none available.
         """
-        min_price = obj.offer_details.aggregate(min_price=Min("price"))["min_price"]
-        return float(min_price) if min_price is not None else 0.00
+        return float(obj.min_price) if obj.min_price is not None else 0.00
 
     def get_min_delivery_time(self, obj):
         """
-        Compute minimum delivery time from related OfferDetails.
+        Return the stored minimum delivery time of the related OfferDetails.
 
         params:
             obj (Offer): Offer instance.
         return:
             int: Minimum delivery time in days or 0 if none available.
         """
-        min_time = obj.offer_details.aggregate(min_time=Min("delivery_time_in_days"))["min_time"]
-        return min_time if min_time is not None else 0
+        return obj.min_delivery_time if obj.min_delivery_time is not None else 0
 
-    def get_image(self, obj):
+    def get_image_variants(self, obj):
         """
-        Return absolute URL for the offer image if present.
+        Return absolute URLs of the thumbnail and card derivatives of the offer image.
 
         params:
             obj (Offer): Offer instance.
         return:
-            str or None: Absolute URL of the image or None if no image.
+            dict or None: Variant URLs, falling back to the original until the variants are recorded.
         """
-        if obj.image:
-            request = self.context.get("request")
-            return request.build_absolute_uri(obj.image.url)
-        return None
+        return thumbnails.get_variant_urls(obj.image, self.context.get("request"), obj.image_variant_names)
@@ -1,12 +1,18 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from offers_app.models import Offer, OfferDetails
+from offers_app.models import Offer, OfferDetails, get_tier_ordering
+from offers_app import cache as offer_cache
+from offers_app.facets import get_facets
+from base_app import conditional
 from .serializers import OfferSerializer, OfferDetailsSerializer
-from rest_framework.permissions import AllowAny
-from .pagination import CustomPageNumberPagination
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAdminUser
+from .pagination import CustomPageNumberPagination, OfferCursorPagination
+from .filters import OfferSearchFilter
 from django.shortcuts import get_object_or_404
-from django.db.models import Min
+from django.db import transaction
+from django.db.models import Max, Prefetch
 from rest_framework.exceptions import PermissionDenied, AuthenticationFailed
 from rest_framework.exceptions import ValidationError
 
@@ -20,7 +26,7 @@ class OfferViewset(viewsets.ModelViewSet):
     serializer_class = OfferSerializer
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        OfferSearchFilter,
         filters.OrderingFilter,
     ]
     permission_classes = [AllowAny]
@@ -35,6 +41,40 @@ class OfferViewset(viewsets.ModelViewSet):
     search_fields = ["title", "description"]
     ordering_fields = ["updated_at"]
 
+    @property
+    def paginator(self):
+        """
+        Select page-number or keyset pagination for the current request.
+
+        Keyset pagination is used when the request carries a cursor or ?pagination=cursor;
+        it always orders by (updated_at, id), newest first, so ?search only filters there
+        and other orderings are rejected, see OfferCursorPagination.
+
+        return:
+            BasePagination: The paginator instance for this request.
+        """
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if params.get("cursor") or params.get("pagination") == "cursor":
+                self._paginator = OfferCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_base_queryset(self):
+        """
+        Build the query plan shared by list and retrieve.
+
+        The owner is joined, the details are prefetched in one query ordered by tier,
+        and the derived minimum values are stored columns, so serializing a page of offers
+        costs a constant number of queries.
+
+        return:
+            QuerySet of Offer instances with user and offer_details loaded
+        """
+        details = OfferDetails.objects.order_by(*get_tier_ordering())
+        return Offer.objects.select_related("user").prefetch_related(Prefetch("offer_details", queryset=details))
+
     def get_queryset(self):
         """
         Optionally filters offers by creator_id, min_price, or max_delivery_time.
@@ -48,7 +88,7 @@ class OfferViewset(viewsets.ModelViewSet):
         raise:
             ValidationError: If max_delivery_time or min_price is not numeric
         """
-        queryset = Offer.objects.annotate(min_price=Min("offer_details__price"))
+        queryset = self.get_base_queryset()
         creator_id = self.request.query_params.get("creator_id")
         max_delivery_time = self.request.query_params.get("max_delivery_time")
         min_price = self.request.query_params.get("min_price")
@@ -61,7 +101,7 @@ class OfferViewset(viewsets.ModelViewSet):
                 max_delivery_time = int(max_delivery_time)
             except ValueError:
                 raise ValidationError({"error": "max_delivery_time must be an integer."})
-            queryset = queryset.filter(offer_details__delivery_time_in_days__lte=max_delivery_time)
+            queryset = queryset.filter(min_delivery_time__lte=max_delivery_time)
 
         if min_price:
             try:
@@ -76,6 +116,9 @@ class OfferViewset(viewsets.ModelViewSet):
         """
         Update an offer and its details, validating permissions and user role.
 
+        The offer and its details are fetched once, all changes are written inside one
+        transaction, and the response is built from the updated in-memory instance.
+
         param:
             request (Request): The HTTP request
             kwargs (dict): Should include 'pk' of the Offer
@@ -89,50 +132,121 @@ class OfferViewset(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             raise AuthenticationFailed({"detail": "Authentication required."})
 
-        instance = get_object_or_404(Offer, pk=kwargs.get("pk"))
+        instance = get_object_or_404(self.get_base_queryset(), pk=kwargs.get("pk"))
 
-        if instance.user != request.user:
+        if instance.user_id != request.user.id:
             raise PermissionDenied({"detail": "You do not have permission to edit this offer."})
 
         user_profile = getattr(request.user, "profile", None)
         if not user_profile or user_profile.type != "business":
             raise PermissionDenied({"detail": "Only business users may edit their offers."})
 
-        details_data = request.data.get("details", [])
-
-        if details_data is not None:
-            existing_details = {detail.offer_type: detail for detail in instance.offer_details.all()}
-            for detail_data in details_data:
-                offer_type = detail_data.get("offer_type")
-                if offer_type in existing_details:
-                    detail_instance = existing_details[offer_type]
-                    for attr, value in detail_data.items():
-                        setattr(detail_instance, attr, value)
-                    detail_instance.save()
-                else:
-                    raise ValidationError({"detail": f"Offer type '{offer_type}' does not exist for this offer."})
-
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List offers, serving repeated requests from the versioned response cache.
 
-        updated_instance = self.get_queryset().get(pk=instance.pk)
-        response_serializer = self.get_serializer(updated_instance)
+        The weak ETag is derived from the catalog version and the query string, so a client
+        revalidating an unchanged page gets a 304 without any database query.
 
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
+        return:
+            Response: Paginated offer data, or 304 if the client copy is current
+        """
+        etag = conditional.make_etag(request, offer_cache.get_catalog_version(), weak=True)
+        not_modified = conditional.get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        key = offer_cache.get_list_key(request)
+        data = offer_cache.get_response_data(key)
+        if data is not None:
+            return conditional.set_validators(Response(data, status=status.HTTP_200_OK), etag)
+
+        response = super().list(request, *args, **kwargs)
+        offer_cache.set_response_data(key, response.data)
+        return conditional.set_validators(response, etag)
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Return offer counts per price range, delivery-time bucket and creator for the filter sidebar.
+
+        Accepts the same filter and search params as the list and answers them with a single
+        aggregate query, cached per filter combination until an offer changes.
+
+        return:
+            Response: JSON with count, price_ranges, delivery_times and creators
+        raise:
+            ValidationError: If max_delivery_time or min_price is not numeric
+        """
+        key = offer_cache.get_facets_key(request)
+        data = offer_cache.get_response_data(key)
+        if data is None:
+            data = get_facets(self.filter_queryset(self.get_queryset()))
+            offer_cache.set_response_data(key, data)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Return the hit and miss counters of the offer response cache (staff only).
+
+        return:
+            Response: JSON with hits, misses and hit_ratio
+        """
+        return Response(offer_cache.get_stats(), status=status.HTTP_200_OK)
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Retrieve a specific offer by ID.
+        Retrieve a specific offer by ID, serving repeated requests from the versioned response cache.
+
+        ETag and Last-Modified come from the newest updated_at of the offer and its details,
+        read in one aggregate query before anything is serialized.
 
+        return:
+            Response: Offer data, or 304 if the client copy is current
         raise:
             AuthenticationFailed: If the user is not logged in
         """
         if not self.request.user.is_authenticated:
             raise AuthenticationFailed({"detail": "Authentication required."})
-        instance = get_object_or_404(Offer, pk=kwargs.get("pk"))
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        pk = kwargs.get("pk")
+        etag = last_modified = None
+        timestamps = (
+            Offer.objects.filter(pk=pk)
+            .values("updated_at")
+            .annotate(details_updated_at=Max("offer_details__updated_at"))
+            .values_list("updated_at", "details_updated_at")
+            .order_by("updated_at")
+            .first()
+        )
+        if timestamps is not None:
+            last_modified = max(timestamp for timestamp in timestamps if timestamp is not None)
+            etag = conditional.make_etag(
+                request, "offer", pk, last_modified.isoformat(), offer_cache.get_offer_version(pk)
+            )
+            not_modified = conditional.get_not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+        key = offer_cache.get_detail_key(request, pk)
+        data = offer_cache.get_response_data(key)
+        if data is None:
+            instance = get_object_or_404(self.get_base_queryset(), pk=pk)
+            data = self.get_serializer(instance).data
+            offer_cache.set_response_data(key, data)
+
+        response = Response(data, status=status.HTTP_200_OK)
+        if etag is not None:
+            conditional.set_validators(response, etag, last_modified)
+        return response
 
     def perform_create(self, serializer):
         """
@@ -149,23 +263,6 @@ class OfferViewset(viewsets.ModelViewSet):
             raise PermissionDenied({"detail": "Only business users may create offers."})
         serializer.save(user=self.request.user)
 
-    def perform_update(self, serializer):
-        """
-        Save offer update, ensuring only the owner can update.
-
-        raise:
-            AuthenticationFailed, PermissionDenied
-        """
-        instance = self.get_object()
-        if not self.request.user.is_authenticated:
-            raise AuthenticationFailed({"detail": "Authentication required."})
-        if instance.user != self.request.user:
-            raise PermissionDenied({"detail": "You do not have permission to edit this offer."})
-        user_profile = getattr(self.request.user, "profile", None)
-        if not user_profile or user_profile.type != "business":
-            raise PermissionDenied({"detail": "Only business users may edit their offers."})
-        serializer.save()
-
     def handle_exception(self, exc):
         """
         Custom exception handler for internal server errors.
@@ -205,15 +302,60 @@ class OfferDetailsViewSet(viewsets.ModelViewSet):
 
     queryset = OfferDetails.objects.all()
     serializer_class = OfferDetailsSerializer
+    max_batch_size = 50
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return several offer details in one request, selected by ?ids= or ?offer=.
+
+        ids may be comma-separated or repeated; results follow the requested order and ids
+        that do not exist are left out. ?offer=<id> returns all details of that offer ordered
+        by tier, basic first. Without either param the default list is returned.
+
+        params:
+            request (HttpRequest): The request object.
+        return:
+            Response: List of offer detail data or error response.
+        """
+        ids_params = request.query_params.getlist("ids")
+        offer_id = request.query_params.get("offer")
+        if not ids_params and offer_id is None:
+            return super().list(request, *args, **kwargs)
+
+        if not request.user.is_authenticated:
+            return Response(
+                {"detail": "User is not authenticated."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        if offer_id is not None:
+            if not offer_id.isdigit():
+                return Response({"detail": "Invalid or missing ID."}, status=status.HTTP_400_BAD_REQUEST)
+            details = OfferDetails.objects.filter(offer_id=offer_id).order_by(*get_tier_ordering())
+            return Response(self.get_serializer(details, many=True).data, status=status.HTTP_200_OK)
+
+        ids = [value.strip() for param in ids_params for value in param.split(",") if value.strip()]
+        if not ids or not all(value.isdigit() for value in ids):
+            return Response({"detail": "Invalid or missing ID."}, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(int(value) for value in ids))
+        if len(ids) > self.max_batch_size:
+            return Response(
+                {"detail": f"At most {self.max_batch_size} ids can be requested at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        details_by_id = OfferDetails.objects.in_bulk(ids)
+        details = [details_by_id[pk] for pk in ids if pk in details_by_id]
+        return Response(self.get_serializer(details, many=True).data, status=status.HTTP_200_OK)
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Retrieve a specific offer detail by ID.
+        Retrieve a specific offer detail by ID, answering 304 from its updated_at when the client copy is current.
 
         params:
             request (HttpRequest): The request object.
         return:
-            Response: Offer detail data or error response.
+            Response: Offer detail data, 304 or error response.
         raise:
             Http404: If the offer detail does not exist.
             PermissionDenied: If the user is not authenticated.
@@ -229,9 +371,19 @@ class OfferDetailsViewSet(viewsets.ModelViewSet):
                 {"detail": "Invalid or missing ID."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        updated_at = OfferDetails.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        if updated_at is not None:
+            etag = conditional.make_etag(request, "offerdetails", pk, updated_at.isoformat())
+            not_modified = conditional.get_not_modified_response(request, etag, updated_at)
+            if not_modified is not None:
+                return not_modified
+
         offer_detail = get_object_or_404(OfferDetails, pk=kwargs.get("pk"))
         serializer = self.get_serializer(offer_detail)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        if updated_at is not None:
+            conditional.set_validators(response, etag, updated_at)
+        return response
 
     def handle_exception(self, exc):
         """
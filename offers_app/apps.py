@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class OffersAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "offers_app"
+
+    def ready(self):
+        from offers_app import signals
+
+        post_migrate.connect(signals.restore_search_index, sender=self)
@@ -0,0 +1,182 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from base_app import cache_versions
+
+CATALOG_VERSION_KEY = "offers:version:catalog"
+OFFER_VERSION_KEY = "offers:version:offer:{}"
+HITS_KEY = "offers:cache:hits"
+MISSES_KEY = "offers:cache:misses"
+
+
+def get_timeout():
+    """
+    Return how long cached offer responses live, in seconds.
+
+    return:
+        int: Value of settings.OFFERS_CACHE_TIMEOUT, 300 by default.
+    """
+    return getattr(settings, "OFFERS_CACHE_TIMEOUT", 300)
+
+
+def _increment(key):
+    """
+    Increment a counter, creating it when missing or evicted.
+
+    params:
+        key (str): Cache key of the counter.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_catalog_version():
+    """
+    Return the version shared by all offers, bumped on every offer write.
+
+    return:
+        int: Current catalog version.
+    """
+    return cache_versions.get_version(CATALOG_VERSION_KEY)
+
+
+def get_offer_version(offer_id):
+    """
+    Return the version of a single offer.
+
+    params:
+        offer_id (int): Offer ID.
+    return:
+        int: Current version of the offer.
+    """
+    return cache_versions.get_version(OFFER_VERSION_KEY.format(offer_id))
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached offer list.
+    """
+    cache_versions.bump_version(CATALOG_VERSION_KEY)
+
+
+def bump_offer_version(offer_id):
+    """
+    Invalidate the cached responses of one offer and every cached offer list.
+
+    params:
+        offer_id (int): Offer ID.
+    """
+    cache_versions.bump_version(OFFER_VERSION_KEY.format(offer_id))
+    bump_catalog_version()
+
+
+def bump_offer_versions(offer_ids):
+    """
+    Invalidate the cached responses of several offers and, once, every cached offer list.
+
+    params:
+        offer_ids (iterable of int): Offer IDs.
+    """
+    for offer_id in offer_ids:
+        cache_versions.bump_version(OFFER_VERSION_KEY.format(offer_id))
+    bump_catalog_version()
+
+
+def _request_digest(request):
+    """
+    Hash the parts of a request that change the response: host, scheme and query params.
+
+    Offer responses do not depend on the requesting user, so the user is not part of the key.
+
+    params:
+        request (Request): The current request.
+    return:
+        str: Hex digest of the normalized request.
+    """
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    raw = f"{request.scheme}://{request.get_host()}|{params}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def get_list_key(request):
+    """
+    Build the cache key of an offer list response.
+
+    params:
+        request (Request): The current request.
+    return:
+        str: Cache key including the catalog version.
+    """
+    return f"offers:list:{get_catalog_version()}:{_request_digest(request)}"
+
+
+def get_facets_key(request):
+    """
+    Build the cache key of an offer facets response.
+
+    params:
+        request (Request): The current request.
+    return:
+        str: Cache key including the catalog version.
+    """
+    return f"offers:facets:{get_catalog_version()}:{_request_digest(request)}"
+
+
+def get_detail_key(request, offer_id):
+    """
+    Build the cache key of a single offer response.
+
+    params:
+        request (Request): The current request.
+        offer_id (int): Offer ID.
+    return:
+        str: Cache key including the offer version.
+    """
+    return f"offers:detail:{offer_id}:{get_offer_version(offer_id)}:{_request_digest(request)}"
+
+
+def get_response_data(key):
+    """
+    Look up cached response data and count the hit or miss.
+
+    params:
+        key (str): Cache key.
+    return:
+        dict or None: Cached response data.
+    """
+    data = cache.get(key)
+    _increment(HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def set_response_data(key, data):
+    """
+    Store response data for get_timeout() seconds.
+
+    params:
+        key (str): Cache key.
+        data (dict): Serialized response data.
+    """
+    cache.set(key, data, get_timeout())
+
+
+def get_stats():
+    """
+    Return the hit and miss counters of the offer response cache.
+
+    return:
+        dict: Hits, misses and the hit ratio.
+    """
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+
+
+def reset_stats():
+    """
+    Reset the hit and miss counters.
+    """
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,66 @@
+from django.db.models import Count, Q
+from offers_app.models import OfferDetails
+
+PRICE_RANGES = [(0, 50), (50, 100), (100, 250), (250, 500), (500, None)]
+DELIVERY_TIME_LIMITS = [1, 3, 7, 14, 30]
+
+
+def _price_condition(lower, upper):
+    """
+    Build the detail filter of one price range, upper bound exclusive.
+
+    params:
+        lower (int): Lowest price in the range.
+        upper (int or None): First price above the range, None for open-ended.
+    return:
+        Q: Condition on OfferDetails.price.
+    """
+    condition = Q(price__gte=lower)
+    if upper is not None:
+        condition &= Q(price__lt=upper)
+    return condition
+
+
+def get_facets(offers):
+    """
+    Count the offers of a filtered queryset per price range, delivery time and creator.
+
+    Everything is computed in one statement over OfferDetails, grouped by creator, with one
+    conditional COUNT(DISTINCT offer) per bucket; the per-creator rows are summed here.
+    An offer counts in a price range if any of its packages is priced in it, and in a
+    delivery-time bucket if it can be delivered within that many days, which matches the
+    max_delivery_time filter.
+
+    params:
+        offers (QuerySet): Filtered Offer queryset, as used by the list endpoint.
+    return:
+        dict: Total count, price_ranges, delivery_times and creators.
+    """
+    buckets = {}
+    for index, (lower, upper) in enumerate(PRICE_RANGES):
+        buckets[f"price_{index}"] = Count("offer", distinct=True, filter=_price_condition(lower, upper))
+    for index, limit in enumerate(DELIVERY_TIME_LIMITS):
+        buckets[f"delivery_{index}"] = Count("offer", distinct=True, filter=Q(delivery_time_in_days__lte=limit))
+
+    rows = list(
+        OfferDetails.objects.filter(offer__in=offers.order_by().values("pk"))
+        .values("offer__user_id", "offer__user__username")
+        .annotate(total=Count("offer", distinct=True), **buckets)
+        .order_by()
+    )
+
+    return {
+        "count": sum(row["total"] for row in rows),
+        "price_ranges": [
+            {"min": lower, "max": upper, "count": sum(row[f"price_{index}"] for row in rows)}
+            for index, (lower, upper) in enumerate(PRICE_RANGES)
+        ],
+        "delivery_times": [
+            {"max_delivery_time": limit, "count": sum(row[f"delivery_{index}"] for row in rows)}
+            for index, limit in enumerate(DELIVERY_TIME_LIMITS)
+        ],
+        "creators": [
+            {"user": row["offer__user_id"], "username": row["offer__user__username"], "count": row["total"]}
+            for row in sorted(rows, key=lambda row: (-row["total"], row["offer__user_id"]))
+        ],
+    }
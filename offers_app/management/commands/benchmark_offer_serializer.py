@@ -0,0 +1,78 @@
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from offers_app.api.serializers import OfferSerializer
+from offers_app.models import Offer, OfferDetails
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark of OfferSerializer on an in-memory list of offers, as rendered by the list endpoint.
+
+    Offers, owners and prefetched details are built in memory, so no query is executed and only
+    serialization (including URL building) is measured.
+    """
+
+    help = "Measure OfferSerializer throughput on a list of in-memory offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=1000, help="Number of offers per round.")
+        parser.add_argument("--rounds", type=int, default=5, help="Number of measured rounds.")
+
+    def handle(self, *args, **options):
+        """
+        Serialize the offer list several times and print the best and mean throughput.
+
+        params:
+            options (dict): Parsed command line options.
+        """
+        offers = self.build_offers(options["offers"])
+        request = Request(APIRequestFactory(SERVER_NAME="localhost").get("/api/offers/"))
+        context = {"request": request, "view": SimpleNamespace(action="list")}
+
+        OfferSerializer(offers[:10], many=True, context=context).data
+        timings = []
+        for _ in range(options["rounds"]):
+            start = time.perf_counter()
+            OfferSerializer(offers, many=True, context=context).data
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        mean = sum(timings) / len(timings)
+        self.stdout.write(f"offers per round: {len(offers)}")
+        self.stdout.write(f"best: {best * 1000:.1f} ms ({len(offers) / best:,.0f} offers/s)")
+        self.stdout.write(f"mean: {mean * 1000:.1f} ms ({len(offers) / mean:,.0f} offers/s)")
+
+    def build_offers(self, count):
+        """
+        Build unsaved offers with owners, images and three prefetched details each.
+
+        params:
+            count (int): Number of offers.
+        return:
+            list of Offer: Offers ready to serialize without database access.
+        """
+        offers = []
+        for index in range(1, count + 1):
+            user = User(id=index, username=f"user{index}", first_name="First", last_name="Last")
+            offer = Offer(
+                id=index,
+                user=user,
+                title=f"Offer {index}",
+                description="Benchmark offer",
+                image=f"uploads/offer{index}.png",
+                min_price=Decimal("100.00"),
+                min_delivery_time=3,
+            )
+            offer._prefetched_objects_cache = {
+                "offer_details": [
+                    OfferDetails(id=index * 3 + position, offer=offer, offer_type=offer_type, price=Decimal("100.00"))
+                    for position, offer_type in enumerate(["basic", "premium", "standard"])
+                ]
+            }
+            offers.append(offer)
+        return offers
@@ -0,0 +1,76 @@
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from auth_app.models import Profile
+from offers_app.api.views import OfferViewset
+from offers_app.models import Offer, OfferDetails
+
+
+class Command(BaseCommand):
+    """
+    Benchmark PATCH /api/offers/<id>/ with a title change and all three details.
+
+    The benchmark data is created inside a transaction that is rolled back afterwards.
+    """
+
+    help = "Measure query count and latency of the offer update endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Number of update requests to send.")
+
+    def handle(self, *args, **options):
+        """
+        Send the update requests and print queries per request and latency percentiles.
+
+        params:
+            options (dict): Parsed command line options.
+        raise:
+            CommandError: If an update request fails.
+        """
+        iterations = options["iterations"]
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+        view = OfferViewset.as_view({"patch": "partial_update"})
+        query_counts = []
+        timings = []
+
+        with transaction.atomic():
+            user = User.objects.create(username="benchmark-offer-update")
+            Profile.objects.create(user=user, type="business", email="benchmark-offer-update@example.com")
+            offer = Offer.objects.create(user=user, title="Benchmark offer")
+            OfferDetails.objects.bulk_create(
+                [OfferDetails(offer=offer, offer_type=offer_type) for offer_type in ["basic", "standard", "premium"]]
+            )
+            url = f"/api/offers/{offer.pk}/"
+
+            for index in range(iterations):
+                payload = {
+                    "title": f"Benchmark offer {index}",
+                    "details": [
+                        {"offer_type": "basic", "price": 100 + index, "delivery_time_in_days": 7},
+                        {"offer_type": "standard", "price": 200 + index, "delivery_time_in_days": 5},
+                        {"offer_type": "premium", "price": 300 + index, "features": ["a", "b"]},
+                    ],
+                }
+                request = factory.patch(url, payload, format="json")
+                force_authenticate(request, user=user)
+
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = view(request, pk=offer.pk)
+                    timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"Update failed with {response.status_code}: {response.data}")
+                query_counts.append(len(queries))
+
+            transaction.set_rollback(True)
+
+        timings.sort()
+        self.stdout.write(f"requests: {iterations}")
+        self.stdout.write(f"queries per request: {statistics.mean(query_counts):.1f}")
+        self.stdout.write(f"mean: {statistics.mean(timings):.2f} ms")
+        self.stdout.write(f"p50: {timings[len(timings) // 2]:.2f} ms")
+        self.stdout.write(f"p95: {timings[int(len(timings) * 0.95)]:.2f} ms")
@@ -0,0 +1,268 @@
+import csv
+import json
+import os
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from offers_app import cache as offer_cache
+from offers_app.api.serializers import OfferDetailsSerializer, OfferSerializer
+from offers_app.models import Offer, OfferDetails, compute_min_values
+
+OFFER_TYPES = ["basic", "standard", "premium"]
+DETAIL_FIELDS = ["title", "revisions", "delivery_time_in_days", "price", "features"]
+
+
+class Command(BaseCommand):
+    """
+    Stream offers with their basic, standard and premium details from a JSONL or CSV file.
+
+    JSONL lines use the POST /api/offers/ payload plus an optional "user" id. CSV files have
+    the columns title, description, user and <offer_type>_<field> for every detail field,
+    e.g. basic_price; features are a JSON list or "|"-separated.
+
+    Records are validated with the OfferSerializer rules and inserted in batches, one
+    transaction per batch. After each batch the number of processed records is written to
+    a checkpoint file, so an interrupted import continues with --resume.
+    """
+
+    help = "Import offers and their details from a JSONL or CSV file in batched transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the .jsonl or .csv file.")
+        parser.add_argument("--format", choices=["jsonl", "csv"], help="File format, guessed from the extension.")
+        parser.add_argument("--user", help="ID or username owning records without a 'user' value.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Offers inserted per transaction.")
+        parser.add_argument("--checkpoint", help="Checkpoint file, defaults to <path>.checkpoint.")
+        parser.add_argument("--resume", action="store_true", help="Skip records committed by a previous run.")
+        parser.add_argument("--strict", action="store_true", help="Abort on the first invalid record.")
+
+    def handle(self, *args, **options):
+        """
+        Read, validate and insert all records, reporting progress after every batch.
+
+        params:
+            options (dict): Parsed command line options.
+        raise:
+            CommandError: If the file or default user cannot be found, or on an invalid record with --strict.
+        """
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File '{path}' does not exist.")
+
+        file_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        self.strict = options["strict"]
+        self.default_user_id = self.resolve_user(options["user"]) if options["user"] else None
+        self.checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        # Serializer fields are built once and reused for every record; building them dominates otherwise.
+        self.offer_serializer = OfferSerializer()
+        self.detail_serializer = OfferDetailsSerializer()
+        skip = self.read_checkpoint() if options["resume"] else 0
+        self.checkpoint = skip
+
+        self.imported = 0
+        self.invalid = 0
+        self.started = time.perf_counter()
+        batch = []
+        position = skip
+
+        for number, record in self.read_records(path, file_format):
+            if number <= skip:
+                continue
+            position = number
+            try:
+                batch.append((number, *self.build(record)))
+            except ValidationError as exc:
+                self.reject(number, exc.detail)
+                continue
+
+            if len(batch) >= options["batch_size"]:
+                self.flush(batch, position)
+                batch = []
+
+        if batch:
+            self.flush(batch, position)
+        elif position != self.checkpoint:
+            # Only invalid records followed the last full batch.
+            self.write_checkpoint(position)
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {self.imported} offers imported, {self.invalid} invalid records skipped.")
+        )
+
+    def resolve_user(self, value):
+        """
+        Resolve the --user option to a user ID.
+
+        params:
+            value (str): User ID or username.
+        return:
+            int: ID of the user.
+        raise:
+            CommandError: If no such user exists.
+        """
+        lookup = {"pk": int(value)} if value.isdigit() else {"username": value}
+        user_id = User.objects.filter(**lookup).values_list("pk", flat=True).first()
+        if user_id is None:
+            raise CommandError(f"User '{value}' does not exist.")
+        return user_id
+
+    def read_records(self, path, file_format):
+        """
+        Yield records one at a time, numbered from 1, without loading the file into memory.
+
+        params:
+            path (str): Input file path.
+            file_format (str): "jsonl" or "csv".
+        return:
+            generator of tuple: (record number, record dict; unreadable records carry an "__error__" key)
+        """
+        with open(path, newline="", encoding="utf-8") as source:
+            if file_format == "csv":
+                for number, row in enumerate(csv.DictReader(source), start=1):
+                    yield number, self.csv_row_to_record(row)
+                return
+
+            for number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield number, {"__error__": f"Invalid JSON: {exc}"}
+
+    def csv_row_to_record(self, row):
+        """
+        Convert a flat CSV row into the nested JSON payload shape.
+
+        params:
+            row (dict): CSV row keyed by column name.
+        return:
+            dict: Record with a 'details' list.
+        """
+        record = {key: row[key] for key in ["title", "description", "user"] if row.get(key)}
+        record["details"] = []
+        for offer_type in OFFER_TYPES:
+            detail = {
+                field: row[f"{offer_type}_{field}"] for field in DETAIL_FIELDS if row.get(f"{offer_type}_{field}")
+            }
+            if not detail:
+                continue
+            features = detail.get("features")
+            if features is not None and features.startswith("["):
+                try:
+                    detail["features"] = json.loads(features)
+                except json.JSONDecodeError as exc:
+                    return {"__error__": f"Invalid {offer_type}_features: {exc}"}
+            elif features is not None:
+                detail["features"] = features.split("|")
+            detail["offer_type"] = offer_type
+            record["details"].append(detail)
+        return record
+
+    def build(self, record):
+        """
+        Validate a record and build unsaved Offer and OfferDetails instances.
+
+        params:
+            record (dict): Offer payload with nested details.
+        return:
+            tuple: (Offer, list of OfferDetails)
+        raise:
+            ValidationError: If the record violates the OfferSerializer rules or has no owner.
+        """
+        if not isinstance(record, dict):
+            raise ValidationError({"detail": "Each record must be a JSON object."})
+        if "__error__" in record:
+            raise ValidationError({"detail": record["__error__"]})
+
+        self.offer_serializer.initial_data = record
+        offer_data = self.offer_serializer.run_validation(record)
+
+        details = []
+        for detail_data in record.get("details") or []:
+            details.append(OfferDetails(**self.detail_serializer.run_validation(detail_data)))
+
+        user_id = record.get("user") or self.default_user_id
+        if not str(user_id or "").isdigit():
+            raise ValidationError({"user": "A valid user id is required (or pass --user)."})
+
+        offer = Offer(user_id=int(user_id), **offer_data, **compute_min_values(details))
+        return offer, details
+
+    def flush(self, batch, position):
+        """
+        Insert a batch of offers and their details in one transaction and write the checkpoint.
+
+        params:
+            batch (list of tuple): (record number, Offer, list of OfferDetails)
+            position (int): Number of the last record read, stored as checkpoint.
+        """
+        user_ids = {offer.user_id for _, offer, _ in batch}
+        existing_user_ids = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+        valid = []
+        for number, offer, details in batch:
+            if offer.user_id in existing_user_ids:
+                valid.append((offer, details))
+            else:
+                self.reject(number, {"user": f"User {offer.user_id} does not exist."})
+
+        if valid:
+            with transaction.atomic():
+                offers = Offer.objects.bulk_create([offer for offer, _ in valid])
+                for offer, (_, details) in zip(offers, valid):
+                    for detail in details:
+                        detail.offer = offer
+                OfferDetails.objects.bulk_create([detail for _, details in valid for detail in details])
+            offer_cache.bump_catalog_version()
+            self.imported += len(valid)
+
+        self.write_checkpoint(position)
+        elapsed = time.perf_counter() - self.started
+        rate = self.imported / elapsed * 60 if elapsed else 0
+        self.stdout.write(
+            f"{position} records read, {self.imported} offers imported, {self.invalid} invalid "
+            f"({rate:,.0f} offers/min)"
+        )
+
+    def reject(self, number, errors):
+        """
+        Report an invalid record, aborting the import in strict mode.
+
+        params:
+            number (int): Record number in the input file.
+            errors (dict or list): Validation errors.
+        raise:
+            CommandError: In strict mode.
+        """
+        self.invalid += 1
+        message = f"Record {number} is invalid: {json.dumps(errors, default=str)}"
+        if self.strict:
+            raise CommandError(message)
+        self.stderr.write(message)
+
+    def read_checkpoint(self):
+        """
+        Read the number of records committed by a previous run.
+
+        return:
+            int: Records to skip, 0 if there is no checkpoint.
+        """
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as checkpoint:
+                return int(checkpoint.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_checkpoint(self, position):
+        """
+        Atomically store the number of processed records.
+
+        params:
+            position (int): Number of the last processed record.
+        """
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint:
+            checkpoint.write(str(position))
+        os.replace(temporary, self.checkpoint_path)
+        self.checkpoint = position
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from offers_app import cache as offer_cache
+from offers_app import search
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the FTS5 offer search index from scratch.
+    """
+
+    help = "Drop and recreate the FTS5 offer search index and its sync triggers."
+
+    def handle(self, *args, **options):
+        """
+        Recreate the index table and triggers and repopulate them from Offer.
+
+        raise:
+            CommandError: If the database does not support FTS5.
+        """
+        if not search.fts5_supported(connection):
+            raise CommandError("FTS5 is not available on this database; search falls back to icontains.")
+
+        with transaction.atomic():
+            search.drop_index(connection)
+            search.create_index(connection)
+        offer_cache.bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the search index for {Offer.objects.count()} offers."))
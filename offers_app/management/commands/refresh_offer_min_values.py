@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from offers_app import cache as offer_cache
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Backfill or repair the denormalized min_price and min_delivery_time columns on Offer.
+    """
+
+    help = "Recompute Offer.min_price and Offer.min_delivery_time from OfferDetails."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", nargs="+", type=int, help="Only refresh the offers with these IDs.")
+
+    def handle(self, *args, **options):
+        """
+        Recompute the minimum columns for all (or the selected) offers in one UPDATE statement
+        and invalidate their cached responses.
+
+        params:
+            options (dict): Parsed command line options.
+        """
+        queryset = Offer.objects.all()
+        if options["ids"]:
+            queryset = queryset.filter(pk__in=options["ids"])
+
+        updated = queryset.refresh_min_values()
+        # The UPDATE leaves updated_at alone, so cached retrieve responses and their ETags
+        # only change with the per-offer versions.
+        offer_cache.bump_offer_versions(queryset.values_list("pk", flat=True).iterator())
+        self.stdout.write(self.style.SUCCESS(f"Refreshed minimum values for {updated} offers."))
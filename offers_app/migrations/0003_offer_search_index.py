@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from offers_app import search
+
+
+def create_search_index(apps, schema_editor):
+    if search.fts5_supported(schema_editor.connection):
+        search.create_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offer_min_price_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
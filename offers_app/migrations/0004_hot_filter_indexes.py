@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-17 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetails',
+            index=models.Index(fields=['price', 'offer'], name='offerdetails_price_offer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetails',
+            index=models.Index(fields=['delivery_time_in_days', 'offer'], name='offerdetails_days_offer_idx'),
+        ),
+    ]
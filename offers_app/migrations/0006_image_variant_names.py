@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 04:04
+
+from django.db import migrations, models
+from base_app import thumbnails
+
+
+def record_existing_image_variants(apps, schema_editor):
+    """
+    Record the derivatives that were already generated, checking the storage once per file.
+    """
+    Offer = apps.get_model('offers_app', 'Offer')
+    for instance in Offer.objects.exclude(image='').exclude(image=None).only('id', 'image').iterator():
+        field_file = instance.image
+        names = {variant: thumbnails.get_variant_name(field_file.name, variant) for variant in thumbnails.get_variants()}
+        if all(field_file.storage.exists(name) for name in names.values()):
+            Offer.objects.filter(pk=instance.pk).update(image_variant_names={'source': field_file.name, **names})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offerdetails_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_variant_names',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(record_existing_image_variants, migrations.RunPython.noop),
+    ]
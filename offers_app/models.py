@@ -1,21 +1,115 @@
 from django.db import models
+from django.db.models import Case, Min, OuterRef, Subquery, Value, When
 from django.contrib.auth.models import User
 
 
+OFFER_TYPES = ("basic", "standard", "premium")
+
+
+def get_tier_ordering():
+    """
+    Return the order_by() arguments that list details by tier: basic, standard, premium,
+    then any other type, ties broken by creation order.
+
+    return:
+        tuple: Ordering expressions for OfferDetails querysets.
+    """
+    rank = Case(
+        *[When(offer_type=offer_type, then=Value(index)) for index, offer_type in enumerate(OFFER_TYPES)],
+        default=Value(len(OFFER_TYPES)),
+    )
+    return (rank, "id")
+
+
+def compute_min_values(details):
+    """
+    Compute the denormalized minimum columns of an Offer from details held in memory.
+
+    params:
+        details (iterable of OfferDetails): The offer's details.
+    return:
+        dict: min_price and min_delivery_time, None when no detail provides a value.
+    """
+    price_field = OfferDetails._meta.get_field("price")
+    time_field = OfferDetails._meta.get_field("delivery_time_in_days")
+    details = list(details)
+    prices = [price_field.to_python(d.price) for d in details if d.price is not None]
+    times = [time_field.to_python(d.delivery_time_in_days) for d in details if d.delivery_time_in_days is not None]
+    return {
+        "min_price": min(prices) if prices else None,
+        "min_delivery_time": min(times) if times else None,
+    }
+
+
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for Offer with helpers for the denormalized minimum columns.
+    """
+
+    def refresh_min_values(self):
+        """
+        Recompute min_price and min_delivery_time from OfferDetails in a single UPDATE.
+
+        return:
+            int: Number of offers updated.
+        """
+        details = OfferDetails.objects.filter(offer=OuterRef("pk")).order_by().values("offer")
+        return self.update(
+            min_price=Subquery(details.annotate(value=Min("price")).values("value")),
+            min_delivery_time=Subquery(details.annotate(value=Min("delivery_time_in_days")).values("value")),
+        )
+
+
 class Offer(models.Model):
     """
     Represents an offer created by a business user.
+
+    min_price and min_delivery_time are denormalized from the related OfferDetails
+    and must be refreshed whenever details are written.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255, default="Untitled Offer")
     image = models.FileField(upload_to="uploads/", null=True, blank=True)
+    # Derivatives of image written by base_app.thumbnails, see generate_variants.
+    image_variant_names = models.JSONField(default=dict, blank=True)
     description = models.TextField(max_length=255, default="No description provided")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.IntegerField(null=True, blank=True, db_index=True)
+
+    objects = OfferQuerySet.as_manager()
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="offer_updated_id_idx"),
+            models.Index(fields=["user", "updated_at"], name="offer_user_updated_idx"),
+        ]
+
+    def refresh_min_values(self, details=None):
+        """
+        Recompute and store min_price and min_delivery_time without touching updated_at.
+
+        params:
+            details (iterable of OfferDetails, optional): Details already in memory.
+                If omitted, the values are aggregated in the database.
+        return:
+            Offer: The instance with refreshed values.
+        """
+        if details is None:
+            values = self.offer_details.aggregate(
+                min_price=Min("price"),
+                min_delivery_time=Min("delivery_time_in_days"),
+            )
+        else:
+            values = compute_min_values(details)
+
+        Offer.objects.filter(pk=self.pk).update(**values)
+        for attr, value in values.items():
+            setattr(self, attr, value)
+        return self
 
 
 class OfferDetails(models.Model):
@@ -30,3 +124,10 @@ class OfferDetails(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     features = models.JSONField(default=list)
     offer_type = models.CharField(max_length=50, null=True, blank=True, default="basic")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["price", "offer"], name="offerdetails_price_offer_idx"),
+            models.Index(fields=["delivery_time_in_days", "offer"], name="offerdetails_days_offer_idx"),
+        ]
@@ -0,0 +1,153 @@
+from django.db import connection as default_connection
+from django.db.utils import OperationalError
+
+FTS_TABLE = "offers_app_offer_fts"
+OFFER_TABLE = "offers_app_offer"
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(title, description, content='{OFFER_TABLE}', content_rowid='id')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+TRIGGERS = [f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_availability = {}
+
+
+def fts5_supported(connection=default_connection):
+    """
+    Check whether the database behind the connection can create FTS5 tables.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to check.
+    return:
+        bool: True on SQLite builds compiled with FTS5.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.offers_fts5_probe USING fts5(value)")
+            cursor.execute("DROP TABLE temp.offers_fts5_probe")
+        except OperationalError:
+            return False
+    return True
+
+
+def fts_available(connection=default_connection):
+    """
+    Check whether the offer FTS index exists, caching the answer per connection alias.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to check.
+    return:
+        bool: True if searches can be served from the FTS index.
+    """
+    if connection.alias not in _availability:
+        _availability[connection.alias] = (
+            connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _availability[connection.alias]
+
+
+def create_index(connection=default_connection):
+    """
+    Create the FTS table and the triggers that keep it in sync with Offer, then fill it.
+
+    The triggers live on the offer table, so a migration that rebuilds that table on SQLite
+    drops them; restore_index puts them back after every migrate.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to use.
+    """
+    with connection.cursor() as cursor:
+        for statement in CREATE_STATEMENTS:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _availability.pop(connection.alias, None)
+
+
+def get_missing_triggers(connection=default_connection):
+    """
+    List the sync triggers of the FTS index that do not exist.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to check.
+    return:
+        list of str: Names of the missing triggers.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [OFFER_TABLE])
+        existing = {name for (name,) in cursor.fetchall()}
+    return [name for name in TRIGGERS if name not in existing]
+
+
+def restore_index(connection=default_connection):
+    """
+    Re-create dropped sync triggers of an existing FTS index and refill it.
+
+    Offers written while the triggers were missing are not in the index, so it is rebuilt
+    from the offer table whenever a trigger had to be re-created.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to use.
+    return:
+        bool: True if triggers were missing and have been restored.
+    """
+    _availability.pop(connection.alias, None)
+    if not fts_available(connection) or not get_missing_triggers(connection):
+        return False
+    create_index(connection)
+    return True
+
+
+def drop_index(connection=default_connection):
+    """
+    Drop the FTS table and its triggers.
+
+    params:
+        connection (BaseDatabaseWrapper): Database connection to use.
+    """
+    with connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+    _availability.pop(connection.alias, None)
+
+
+def build_match_query(terms):
+    """
+    Turn search terms into an FTS5 MATCH expression where every term must match as a prefix.
+
+    params:
+        terms (list of str): Search terms as parsed by SearchFilter.
+    return:
+        str: MATCH expression with each term quoted.
+    """
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
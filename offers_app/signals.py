@@ -0,0 +1,94 @@
+from functools import partial
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from base_app import thumbnails
+from offers_app import cache as offer_cache
+from offers_app import search
+from offers_app.models import Offer, OfferDetails
+
+
+@receiver(post_save, sender=OfferDetails)
+@receiver(post_delete, sender=OfferDetails)
+def refresh_offer_min_values(sender, instance, **kwargs):
+    """
+    Keep the denormalized minimum columns of the parent Offer in sync with its details.
+
+    params:
+        sender (type): The OfferDetails model class.
+        instance (OfferDetails): The saved or deleted detail.
+    """
+    Offer.objects.filter(pk=instance.offer_id).refresh_min_values()
+    offer_cache.bump_offer_version(instance.offer_id)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_offer_cache(sender, instance, **kwargs):
+    """
+    Invalidate cached responses of a written offer and all cached offer lists.
+
+    params:
+        sender (type): The Offer model class.
+        instance (Offer): The saved or deleted offer.
+    """
+    offer_cache.bump_offer_version(instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+def schedule_offer_image_variants(sender, instance, **kwargs):
+    """
+    Queue thumbnail and card derivatives of a new or changed offer image.
+
+    params:
+        sender (type): The Offer model class.
+        instance (Offer): The saved offer.
+    """
+    thumbnails.schedule_variants(
+        instance.image, instance.image_variant_names, on_complete=partial(store_offer_image_variants, instance.pk)
+    )
+
+
+def store_offer_image_variants(offer_id, names):
+    """
+    Record generated derivatives on the offer, unless its image was replaced meanwhile,
+    and refresh its cached responses.
+
+    params:
+        offer_id (int): Offer ID.
+        names (dict): Result of thumbnails.generate_variants.
+    """
+    Offer.objects.filter(pk=offer_id, image=names["source"]).update(image_variant_names=names)
+    offer_cache.bump_offer_version(offer_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_offer_lists_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate cached offer lists, which embed the owner's name, when a user changes.
+
+    Saves that only touch last_login (every login) are ignored.
+
+    params:
+        sender (type): The User model class.
+        instance (User): The saved user.
+        update_fields (frozenset, optional): Fields passed to save().
+    """
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    offer_cache.bump_catalog_version()
+
+
+def restore_search_index(sender, using, **kwargs):
+    """
+    Re-create the FTS sync triggers after migrate, since rebuilding the offer table on SQLite drops them.
+
+    Connected in OffersAppConfig.ready as a post_migrate handler.
+
+    params:
+        sender (AppConfig): The offers_app config.
+        using (str): Alias of the migrated database.
+    """
+    if search.restore_index(connections[using]):
+        offer_cache.bump_catalog_version()
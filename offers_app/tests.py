@@ -1,3 +1,652 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import shutil
+import tempfile
+from functools import partial
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from base_app import thumbnails
+from offers_app import cache as offer_cache
+from offers_app import search
+from offers_app.models import Offer, OfferDetails
+from offers_app.signals import store_offer_image_variants
 
-# Create your tests here.
+
+def create_offer(user, title="Offer", prices=(100, 200, 300), delivery_times=(7, 5, 3)):
+    """
+    Create an offer with basic, standard and premium details and refreshed minimum values.
+
+    params:
+        user (User): Owner of the offer.
+        title (str): Offer title.
+        prices (tuple): Prices for basic, standard and premium.
+        delivery_times (tuple): Delivery times in days for basic, standard and premium.
+    return:
+        Offer: The created offer.
+    """
+    offer = Offer.objects.create(user=user, title=title, description=f"{title} description")
+    details = [
+        OfferDetails(
+            offer=offer,
+            title=f"{title} {offer_type}",
+            revisions=index,
+            delivery_time_in_days=delivery_time,
+            price=price,
+            features=["feature"],
+            offer_type=offer_type,
+        )
+        for index, (offer_type, price, delivery_time) in enumerate(
+            zip(["basic", "standard", "premium"], prices, delivery_times)
+        )
+    ]
+    OfferDetails.objects.bulk_create(details)
+    return offer.refresh_min_values(details)
+
+
+class OfferQueryBudgetTests(APITestCase):
+    """
+    Pin the number of SQL queries used by the offer list and retrieve endpoints.
+    """
+
+    LIST_QUERIES = 3  # COUNT for pagination, offers joined with users, prefetched details
+    RETRIEVE_QUERIES = 3  # ETag timestamps, offer joined with user, prefetched details
+
+    def setUp(self):
+        cache.clear()
+        self.business_user = User.objects.create(username="business")
+        Profile.objects.create(user=self.business_user, type="business", email="business@example.com")
+
+    def create_offers(self, count):
+        start = Offer.objects.count()
+        for index in range(start, start + count):
+            owner = User.objects.create(username=f"owner{index}")
+            create_offer(owner, title=f"Offer {index}")
+
+    def test_list_query_count_is_constant_for_default_page(self):
+        self.create_offers(1)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("offers-list"))
+        self.assertEqual(len(response.data["results"]), 1)
+
+        self.create_offers(6)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("offers-list"))
+        self.assertEqual(len(response.data["results"]), 6)
+
+    def test_list_query_count_is_constant_for_max_page_size(self):
+        self.create_offers(40)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("offers-list"), {"page_size": 100})
+        self.assertEqual(len(response.data["results"]), 40)
+        self.assertTrue(all(len(offer["details"]) == 3 for offer in response.data["results"]))
+        self.assertTrue(all(offer["user_details"]["username"] for offer in response.data["results"]))
+
+    def test_list_with_filters_keeps_query_budget(self):
+        self.create_offers(10)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(
+                reverse("offers-list"),
+                {"min_price": 50, "max_delivery_time": 3, "creator_id": self.business_user.id + 1},
+            )
+        self.assertEqual(response.data["count"], 1)
+
+    def test_list_expands_details_without_extra_queries(self):
+        self.create_offers(3)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("offers-list"), {"expand": "details"})
+        details = response.data["results"][0]["details"]
+        self.assertEqual([detail["offer_type"] for detail in details], ["basic", "standard", "premium"])
+        self.assertEqual(details[0]["price"], "100.00")
+        self.assertIn("features", details[0])
+
+    def test_retrieve_query_count(self):
+        offer = create_offer(self.business_user)
+        self.client.force_authenticate(self.business_user)
+        with self.assertNumQueries(self.RETRIEVE_QUERIES):
+            response = self.client.get(reverse("offers-detail", args=[offer.id]))
+        self.assertEqual(response.data["min_price"], 100.0)
+        self.assertEqual(response.data["min_delivery_time"], 3)
+        expected_ids = list(offer.offer_details.order_by("id").values_list("id", flat=True))
+        self.assertEqual([detail["id"] for detail in response.data["details"]], expected_ids)
+
+
+class OfferMinValuesTests(APITestCase):
+    """
+    Denormalized Offer.min_price and Offer.min_delivery_time.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.offer = create_offer(User.objects.create(username="seller"))
+
+    def get_min_values(self):
+        return Offer.objects.values("min_price", "min_delivery_time").get(pk=self.offer.pk)
+
+    def test_saving_changing_and_deleting_details_keep_minimums(self):
+        cheap = OfferDetails.objects.create(
+            offer=self.offer, title="Cheap", revisions=0, delivery_time_in_days=10, price=50, offer_type="basic"
+        )
+        self.assertEqual(self.get_min_values(), {"min_price": 50, "min_delivery_time": 3})
+
+        premium = self.offer.offer_details.get(offer_type="premium")
+        premium.delivery_time_in_days = 9
+        premium.save()
+        self.assertEqual(self.get_min_values(), {"min_price": 50, "min_delivery_time": 5})
+
+        cheap.delete()
+        self.assertEqual(self.get_min_values(), {"min_price": 100, "min_delivery_time": 5})
+
+        for detail in self.offer.offer_details.all():
+            detail.delete()
+        self.assertEqual(self.get_min_values(), {"min_price": None, "min_delivery_time": None})
+
+    def test_migration_backfill_and_refresh_command(self):
+        migration = import_module("offers_app.migrations.0002_offer_min_price_min_delivery_time")
+        Offer.objects.update(min_price=None, min_delivery_time=None)
+        migration.backfill_min_values(apps, None)
+        self.assertEqual(self.get_min_values(), {"min_price": 100, "min_delivery_time": 3})
+
+        Offer.objects.update(min_price=1, min_delivery_time=1)
+        output = StringIO()
+        call_command("refresh_offer_min_values", "--ids", str(self.offer.pk), stdout=output)
+        self.assertIn("Refreshed minimum values for 1 offers.", output.getvalue())
+        self.assertEqual(self.get_min_values(), {"min_price": 100, "min_delivery_time": 3})
+
+    def test_refresh_command_invalidates_cached_retrieve_responses(self):
+        self.client.force_authenticate(self.offer.user)
+        url = reverse("offers-detail", args=[self.offer.pk])
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=1)
+        response = self.client.get(url)
+        self.assertEqual(response.data["min_price"], 1.0)
+        etag = response["ETag"]
+
+        call_command("refresh_offer_min_values", stdout=StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["min_price"], 100.0)
+
+    def test_max_delivery_time_filters_on_the_stored_column(self):
+        url = reverse("offers-list")
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"max_delivery_time": 3})
+        self.assertEqual(response.data["count"], 1)
+        count_sql = captured.captured_queries[0]["sql"]
+        self.assertIn('"offers_app_offer"."min_delivery_time" <= 3', count_sql)
+        self.assertNotIn("offers_app_offerdetails", count_sql)
+
+        Offer.objects.filter(pk=self.offer.pk).update(min_delivery_time=2)
+        cache.clear()
+        self.assertEqual(self.client.get(url, {"max_delivery_time": 2}).data["count"], 1)
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Full-text search over offer title and description through ?search=.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="searcher")
+
+    def search(self, term):
+        response = self.client.get(reverse("offers-list"), {"search": term})
+        return [offer["title"] for offer in response.data["results"]]
+
+    def test_search_ranks_and_follows_updates(self):
+        create_offer(self.user, title="Logo design")
+        best = create_offer(self.user, title="Python Django API")
+        best.description = "Python backend with Django and Python tooling"
+        best.save()
+        create_offer(self.user, title="Website in Python")
+
+        self.assertEqual(self.search("python"), ["Python Django API", "Website in Python"])
+        self.assertEqual(self.search("pyth djan"), ["Python Django API"])
+
+        best.title = "Rust service"
+        best.description = "Systems work"
+        best.save()
+        self.assertEqual(self.search("python"), ["Website in Python"])
+
+        Offer.objects.filter(title="Website in Python").delete()
+        self.assertEqual(self.search("python"), [])
+
+    def test_migrate_restores_dropped_triggers(self):
+        with connection.cursor() as cursor:
+            for name in search.TRIGGERS:
+                cursor.execute(f"DROP TRIGGER {name}")
+        create_offer(self.user, title="Python tutoring")
+        self.assertEqual(search.get_missing_triggers(), search.TRIGGERS)
+
+        call_command("migrate", verbosity=0)
+        self.assertEqual(search.get_missing_triggers(), [])
+        self.assertEqual(self.search("python"), ["Python tutoring"])
+
+    def test_search_falls_back_without_index(self):
+        create_offer(self.user, title="Logo design")
+        with mock.patch("offers_app.search.fts_available", return_value=False):
+            self.assertEqual(self.search("ogo"), ["Logo design"])
+
+
+class OfferCursorPaginationTests(APITestCase):
+    """
+    Keyset pagination of the offer list, selected per request.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="paginator")
+        self.offers = [create_offer(self.user, title=f"Offer {index}", prices=(index, 200, 300)) for index in range(9)]
+        Offer.objects.filter(pk__in=[offer.pk for offer in self.offers[3:6]]).update(
+            updated_at=self.offers[3].updated_at
+        )
+
+    def collect(self, params):
+        titles = []
+        response = self.client.get(reverse("offers-list"), params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            titles.extend(offer["title"] for offer in response.data["results"])
+            if not response.data["next"]:
+                return titles, response.data
+            response = self.client.get(response.data["next"])
+
+    def test_walks_all_offers_in_keyset_order(self):
+        titles, last_page = self.collect({"pagination": "cursor", "page_size": 2})
+        expected = Offer.objects.order_by("-updated_at", "-id").values_list("title", flat=True)
+        self.assertEqual(titles, list(expected))
+        self.assertEqual(last_page["count"], 9)
+        self.assertNotIn("previous", last_page)
+
+    def test_applies_filters(self):
+        titles, _ = self.collect({"pagination": "cursor", "page_size": 2, "min_price": 4, "search": "offer"})
+        self.assertEqual(sorted(titles), [f"Offer {index}" for index in range(4, 9)])
+
+    def test_search_is_not_ranked_and_other_orderings_are_rejected(self):
+        titles, _ = self.collect({"pagination": "cursor", "page_size": 20, "search": "offer"})
+        expected = Offer.objects.order_by("-updated_at", "-id").values_list("title", flat=True)
+        self.assertEqual(titles, list(expected))
+
+        response = self.client.get(reverse("offers-list"), {"pagination": "cursor", "ordering": "updated_at"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ordering", response.data)
+        response = self.client.get(reverse("offers-list"), {"pagination": "cursor", "ordering": "-updated_at"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_numbers_remain_default(self):
+        response = self.client.get(reverse("offers-list"))
+        self.assertEqual(response.data["count"], 9)
+        self.assertIn("previous", response.data)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("offers-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+        for position in ([None, None], [None, 1], ["2025-01-01T00:00:00Z"], {"id": 1}):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            response = self.client.get(reverse("offers-list"), {"pagination": "cursor", "cursor": cursor})
+            self.assertEqual(response.status_code, 404)
+
+
+class OfferResponseCacheTests(APITestCase):
+    """
+    Versioned caching of the offer list and detail responses.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="cached")
+        self.offer = create_offer(self.user, title="Cached offer")
+
+    def test_list_is_served_from_cache_until_an_offer_changes(self):
+        self.client.get(reverse("offers-list"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("offers-list"))
+        self.assertEqual(response.data["results"][0]["title"], "Cached offer")
+
+        detail = self.offer.offer_details.get(offer_type="basic")
+        detail.price = 10
+        detail.save()
+        response = self.client.get(reverse("offers-list"))
+        self.assertEqual(response.data["results"][0]["min_price"], 10.0)
+
+    def test_list_key_depends_on_query_params(self):
+        create_offer(self.user, title="Second offer")
+        self.client.get(reverse("offers-list"))
+        response = self.client.get(reverse("offers-list"), {"search": "second"})
+        self.assertEqual([offer["title"] for offer in response.data["results"]], ["Second offer"])
+
+    def test_retrieve_is_invalidated_per_offer(self):
+        self.client.force_authenticate(self.user)
+        url = reverse("offers-detail", args=[self.offer.id])
+        self.client.get(url)
+        # Only the updated_at lookup for the ETag runs; the body comes from the cache.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        self.offer.title = "Renamed offer"
+        self.offer.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["title"], "Renamed offer")
+
+    def test_cache_stats_counts_hits_and_misses(self):
+        self.client.get(reverse("offers-list"))
+        self.client.get(reverse("offers-list"))
+        admin = User.objects.create(username="admin", is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse("offers-cache-stats"))
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+
+
+class OfferConditionalGetTests(APITestCase):
+    """
+    ETag / Last-Modified revalidation of offer and offer detail responses.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="poller")
+        self.offer = create_offer(self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_offer_returns_304_until_a_detail_changes(self):
+        url = reverse("offers-detail", args=[self.offer.id])
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        detail = self.offer.offer_details.get(offer_type="premium")
+        detail.title = "Changed"
+        detail.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_offer_detail_honours_if_modified_since(self):
+        url = reverse("offerdetails-detail", args=[self.offer.offer_details.first().id])
+        last_modified = self.client.get(url)["Last-Modified"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_has_weak_etag_from_catalog_version(self):
+        etag = self.client.get(reverse("offers-list"))["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("offers-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        create_offer(self.user, title="New offer")
+        response = self.client.get(reverse("offers-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class OfferFacetsTests(APITestCase):
+    """
+    Price, delivery-time and creator facets of the filtered offer list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create(username="alice")
+        self.bob = User.objects.create(username="bob")
+        create_offer(self.alice, "Cheap", prices=(20, 60, 120), delivery_times=(10, 5, 2))
+        create_offer(self.alice, "Mid", prices=(80, 90, 300), delivery_times=(20, 14, 7))
+        create_offer(self.bob, "Premium", prices=(600, 700, 800), delivery_times=(30, 20, 14))
+
+    def test_counts_buckets_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("offers-facets"))
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual([bucket["count"] for bucket in response.data["price_ranges"]], [1, 2, 1, 1, 1])
+        self.assertEqual([bucket["count"] for bucket in response.data["delivery_times"]], [0, 1, 2, 3, 3])
+        self.assertEqual(
+            [(creator["username"], creator["count"]) for creator in response.data["creators"]],
+            [("alice", 2), ("bob", 1)],
+        )
+
+    def test_applies_list_filters_and_caches_until_offers_change(self):
+        params = {"min_price": 50}
+        response = self.client.get(reverse("offers-facets"), params)
+        self.assertEqual(response.data["count"], 2)
+        with self.assertNumQueries(0):
+            self.client.get(reverse("offers-facets"), params)
+
+        create_offer(self.bob, "Another", prices=(55, 65, 75))
+        response = self.client.get(reverse("offers-facets"), params)
+        self.assertEqual(response.data["count"], 3)
+
+
+class OfferDetailsBatchTests(APITestCase):
+    """
+    Batch retrieve of offer details by ids or offer.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username="batcher")
+        self.offer = create_offer(self.user)
+        self.ids = list(self.offer.offer_details.order_by("id").values_list("id", flat=True))
+        self.client.force_authenticate(self.user)
+
+    def test_returns_requested_ids_in_order(self):
+        requested = [self.ids[2], 999999, self.ids[0]]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("offerdetails-list"), {"ids": ",".join(map(str, requested))})
+        self.assertEqual([detail["id"] for detail in response.data], [self.ids[2], self.ids[0]])
+
+    def test_returns_all_details_of_an_offer(self):
+        response = self.client.get(reverse("offerdetails-list"), {"offer": self.offer.id})
+        self.assertEqual([detail["offer_type"] for detail in response.data], ["basic", "standard", "premium"])
+
+    def test_details_are_ordered_by_tier_not_by_name_or_id(self):
+        OfferDetails.objects.filter(pk=self.ids[0]).update(offer_type="premium")
+        OfferDetails.objects.filter(pk=self.ids[2]).update(offer_type="basic")
+        expected = [self.ids[2], self.ids[1], self.ids[0]]
+
+        response = self.client.get(reverse("offerdetails-list"), {"offer": self.offer.id})
+        self.assertEqual([detail["id"] for detail in response.data], expected)
+        response = self.client.get(reverse("offers-detail", args=[self.offer.id]), {"expand": "details"})
+        self.assertEqual([detail["id"] for detail in response.data["details"]], expected)
+
+    def test_rejects_oversized_and_invalid_batches(self):
+        too_many = ",".join(str(pk) for pk in range(1, 52))
+        self.assertEqual(self.client.get(reverse("offerdetails-list"), {"ids": too_many}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("offerdetails-list"), {"ids": "1,x"}).status_code, 400)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse("offerdetails-list"), {"ids": "1"}).status_code, 401)
+
+
+class OfferUpdateTests(APITestCase):
+    """
+    Single-pass update of an offer and its details.
+    """
+
+    UPDATE_QUERIES = 7  # offer with user, details, savepoint, offer, bulk details, minimums, release
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="owner")
+        Profile.objects.create(user=self.user, type="business", email="owner@example.com")
+        self.offer = create_offer(self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse("offers-detail", args=[self.offer.id])
+
+    def test_updates_offer_and_details_in_one_pass(self):
+        payload = {
+            "title": "Updated",
+            "details": [
+                {"offer_type": "basic", "price": "50.00", "delivery_time_in_days": 1},
+                {"offer_type": "premium", "features": ["x", "y"]},
+            ],
+        }
+        with self.assertNumQueries(self.UPDATE_QUERIES):
+            response = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Updated")
+        self.assertEqual(response.data["min_price"], 50.0)
+        self.assertEqual(response.data["min_delivery_time"], 1)
+        basic = self.offer.offer_details.get(offer_type="basic")
+        self.assertEqual((basic.price, basic.delivery_time_in_days), (50, 1))
+        self.assertEqual(self.offer.offer_details.get(offer_type="premium").features, ["x", "y"])
+        self.offer.refresh_from_db()
+        self.assertEqual((self.offer.min_price, self.offer.min_delivery_time), (50, 1))
+
+    def test_unknown_offer_type_rolls_back(self):
+        payload = {"title": "Updated", "details": [{"offer_type": "basic", "price": 1}, {"offer_type": "gold"}]}
+        response = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Offer")
+        self.assertEqual(self.offer.offer_details.get(offer_type="basic").price, 100)
+
+    def test_invalid_detail_value_is_rejected(self):
+        response = self.client.patch(self.url, {"details": [{"offer_type": "basic", "price": "abc"}]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class OfferImageVariantTests(APITestCase):
+    """
+    Thumbnail and card derivatives of offer images.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        buffer = BytesIO()
+        Image.new("RGB", (1200, 900), "red").save(buffer, format="PNG")
+        self.offer = create_offer(User.objects.create(username="artist"))
+        self.offer.image.save("picture.png", ContentFile(buffer.getvalue()))
+
+    def get_variants(self):
+        response = self.client.get(reverse("offers-list"))
+        return response.data["results"][0]["image_variants"]
+
+    def test_variants_fall_back_to_original_until_generated(self):
+        self.assertTrue(all(url.endswith(self.offer.image.name) for url in self.get_variants().values()))
+
+        names = thumbnails.generate_variants(self.offer.image)
+        self.assertTrue(all(url.endswith(self.offer.image.name) for url in self.get_variants().values()))
+        store_offer_image_variants(self.offer.pk, names)
+
+        with mock.patch.object(FileSystemStorage, "exists", side_effect=AssertionError("storage accessed")):
+            variants = self.get_variants()
+        self.assertTrue(variants["thumbnail"].endswith("_thumbnail.webp"))
+        self.assertTrue(variants["card"].endswith("_card.webp"))
+        with Image.open(self.offer.image.storage.path(names["thumbnail"])) as thumbnail:
+            self.assertEqual(thumbnail.size, (200, 200))
+
+    def test_only_new_or_changed_images_are_queued(self):
+        offer = Offer.objects.get(pk=self.offer.pk)
+        with mock.patch("base_app.thumbnails.get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                offer.title = "Renamed"
+                offer.save()
+            self.assertEqual(get_executor.return_value.submit.call_count, 1)
+            thumbnails._pending.clear()
+
+            Offer.objects.filter(pk=offer.pk).update(image_variant_names={"source": offer.image.name})
+            offer = Offer.objects.get(pk=offer.pk)
+            with mock.patch.object(FileSystemStorage, "exists", side_effect=AssertionError("storage accessed")):
+                with self.captureOnCommitCallbacks(execute=True):
+                    offer.save()
+            self.assertEqual(get_executor.return_value.submit.call_count, 1)
+
+    def test_worker_records_variants_and_closes_its_connections(self):
+        with mock.patch("base_app.thumbnails.connections") as connections:
+            thumbnails._run(self.offer.image, partial(store_offer_image_variants, self.offer.pk))
+        connections.close_all.assert_called_once_with()
+        names = Offer.objects.get(pk=self.offer.pk).image_variant_names
+        self.assertEqual(set(names), {"source", "thumbnail", "card"})
+
+    def test_links_match_resolver_and_storage_urls(self):
+        offer = self.client.get(reverse("offers-list")).data["results"][0]
+
+        self.assertEqual(offer["image"], f"http://testserver{self.offer.image.url}")
+        for detail in offer["details"]:
+            self.assertEqual(detail["url"], reverse("offerdetails-detail", args=[detail["id"]]).replace("/api", ""))
+
+
+class ImportOffersCommandTests(APITestCase):
+    """
+    Streaming bulk import of offers from JSONL.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="importer")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, "offers.jsonl")
+
+    def write_records(self, records):
+        with open(self.path, "w", encoding="utf-8") as target:
+            for record in records:
+                target.write(record if isinstance(record, str) else json.dumps(record))
+                target.write("\n")
+
+    def record(self, title, prices=(10, 20, 30)):
+        return {
+            "title": title,
+            "description": "Imported",
+            "details": [
+                {"offer_type": offer_type, "price": price, "delivery_time_in_days": 9 - index}
+                for index, (offer_type, price) in enumerate(zip(["basic", "standard", "premium"], prices))
+            ],
+        }
+
+    def test_imports_valid_records_and_resumes(self):
+        missing_type = self.record("Missing type")
+        missing_type["details"].pop()
+        self.write_records([self.record("First"), "{broken", missing_type, self.record("Second", (5, 50, 500))])
+
+        call_command(
+            "import_offers", self.path, user=self.user.username, batch_size=1, stdout=StringIO(), stderr=StringIO()
+        )
+
+        self.assertEqual(sorted(Offer.objects.values_list("title", flat=True)), ["First", "Second"])
+        second = Offer.objects.get(title="Second")
+        self.assertEqual((second.min_price, second.min_delivery_time), (5, 7))
+        self.assertEqual(second.offer_details.count(), 3)
+
+        call_command("import_offers", self.path, user=self.user.username, resume=True, stdout=StringIO())
+        self.assertEqual(Offer.objects.count(), 2)
+
+    def test_progress_is_reported_once_per_batch(self):
+        self.write_records([self.record("First"), self.record("Second"), "{broken"])
+        output = StringIO()
+        call_command(
+            "import_offers", self.path, user=self.user.username, batch_size=2, stdout=output, stderr=StringIO()
+        )
+        progress = [line for line in output.getvalue().splitlines() if "records read" in line]
+        self.assertEqual(len(progress), 1)
+        self.assertTrue(progress[0].startswith("2 records read, 2 offers imported, 0 invalid"))
+        with open(f"{self.path}.checkpoint", encoding="utf-8") as checkpoint:
+            self.assertEqual(checkpoint.read(), "3")
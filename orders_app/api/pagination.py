@@ -0,0 +1,37 @@
+from django.db.models import Q
+from base_app.api.pagination import KeysetPagination
+
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for a user's orders on (created_at, id), newest first.
+
+    A user sees the orders they placed and the orders they received. Instead of one
+    OR filter, which SQLite cannot serve from a single index in created_at order, each
+    side is fetched as its own limited subquery on the (customer_user, created_at, id)
+    and (business_user, created_at, id) indexes and the two are merged, so every page
+    reads at most 2 * (page_size + 1) index entries however many orders the user has.
+    """
+
+    page_size = 20
+    ordering = ("-created_at", "-id")
+    user_fields = ("customer_user", "business_user")
+
+    def get_page(self, queryset, position, limit):
+        """
+        Fetch up to limit orders after the position from both sides of the user's orders.
+
+        params:
+            queryset (QuerySet): The filtered orders of the user.
+            position (list or None): Values of the ordering fields, None on the first page.
+            limit (int): Maximum number of rows.
+        return:
+            list: Order instances in keyset order.
+        """
+        user_id = self.request.user.id
+        branches = Q()
+        for field in self.user_fields:
+            branch = self.get_page_queryset(queryset.filter(**{field: user_id}), position)[:limit]
+            branches |= Q(pk__in=branch.values("pk"))
+        # The outer query only looks up the at most 2 * limit ids, so it must not repeat the filters.
+        return list(queryset.model.objects.filter(branches).order_by(*self.fields)[:limit])
@@ -41,3 +41,25 @@ class IsCustomerOrAdmin(permissions.BasePermission):
             return True
 
         return obj.customer_user == request.user or request.user.is_staff
+
+
+class IsBusinessUserOrAdmin(permissions.BasePermission):
+    """
+    Only the business user named by the business_user_id URL argument or admin users can access this resource.
+    """
+
+    message = "You can only view your own order statistics."
+
+    def has_permission(self, request, view):
+        """
+        Allow authenticated users whose ID is business_user_id, and admins.
+
+        params:
+            request: The HTTP request object.
+            view: The view that is being accessed.
+        returns:
+            bool: True if the user has permission, False otherwise.
+        """
+        return request.user.is_authenticated and (
+            request.user.id == view.kwargs.get("business_user_id") or request.user.is_staff
+        )
@@ -1,8 +1,36 @@
+from collections import Counter
+from django.db import transaction
 from rest_framework import serializers
-from orders_app.models import Order
+from orders_app import events, export, stats, transitions
+from orders_app.models import ArchivedOrder, Order, OrderEvent
 from offers_app.models import OfferDetails
 
 
+def build_order(offer_detail, customer_user):
+    """
+    Build an unsaved in_progress Order copying the terms of an offer detail.
+
+    params:
+        offer_detail (OfferDetails): Ordered detail, with its offer loaded.
+        customer_user (User): The ordering customer.
+    return:
+        Order: Unsaved order.
+    """
+    offer = offer_detail.offer
+    return Order(
+        customer_user=customer_user,
+        business_user_id=offer.user_id,
+        offer_detail=offer_detail,
+        title=offer.title,
+        revisions=offer_detail.revisions,
+        delivery_time_in_days=offer_detail.delivery_time_in_days,
+        price=offer_detail.price,
+        features=offer_detail.features,
+        offer_type=offer_detail.offer_type,
+        status="in_progress",
+    )
+
+
 class OrderSerializer(serializers.ModelSerializer):
     """
     Serializer for Order model providing read-only access to related user and offer fields.
@@ -25,6 +53,19 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for archived orders: the fields of OrderSerializer plus archived_at.
+
+    return:
+        Serialized ArchivedOrder data.
+    """
+
+    class Meta:
+        model = ArchivedOrder
+        fields = "__all__"
+
+
 class CreateOrderSerializer(serializers.Serializer):
     """
     Serializer to create an Order from an offer detail ID.
@@ -50,24 +91,8 @@ class CreateOrderSerializer(serializers.Serializer):
         raise:
             OfferDetails.DoesNotExist: If offer_detail_id is invalid.
         """
-        offer_detail = OfferDetails.objects.get(id=validated_data["offer_detail_id"])
-        offer = offer_detail.offer
-
-        customer_user = self.context["request"].user
-        business_user = offer.user
-
-        order = Order(
-            customer_user=customer_user,
-            business_user=business_user,
-            offer_detail=offer_detail,
-            title=offer.title,
-            revisions=offer_detail.revisions,
-            delivery_time_in_days=offer_detail.delivery_time_in_days,
-            price=offer_detail.price,
-            features=offer_detail.features,
-            offer_type=offer_detail.offer_type,
-            status="in_progress",
-        )
+        offer_detail = OfferDetails.objects.select_related("offer").get(id=validated_data["offer_detail_id"])
+        order = build_order(offer_detail, self.context["request"].user)
         order.save(force_insert=True)
 
         return order
@@ -83,8 +108,8 @@ class CreateOrderSerializer(serializers.Serializer):
         """
         data = {
             "id": instance.id,
-            "customer_user": instance.customer_user.id,
-            "business_user": instance.business_user.id,
+            "customer_user": instance.customer_user_id,
+            "business_user": instance.business_user_id,
             "title": instance.title,
             "revisions": instance.revisions,
             "delivery_time_in_days": instance.delivery_time_in_days,
@@ -98,6 +123,128 @@ class CreateOrderSerializer(serializers.Serializer):
         return data
 
 
+class BulkOrderStatusSerializer(serializers.Serializer):
+    """
+    Serializer to move several orders to a new status at once.
+
+    params:
+        ids (list of int): IDs of the orders.
+        status (str): Target status, "completed" or "cancelled".
+    """
+
+    max_batch_size = 100
+
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1, max_length=max_batch_size)
+    status = serializers.ChoiceField(
+        choices=sorted({target for targets in transitions.TRANSITIONS.values() for target in targets})
+    )
+
+
+class OrderEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for entries of the order event feeds.
+
+    return:
+        Serialized OrderEvent data with order, customer_user and business_user as IDs.
+    """
+
+    order = serializers.IntegerField(source="order_id")
+    customer_user = serializers.IntegerField(source="customer_user_id")
+    business_user = serializers.IntegerField(source="business_user_id")
+
+    class Meta:
+        model = OrderEvent
+        fields = ["id", "order", "kind", "status", "old_status", "customer_user", "business_user", "created_at"]
+
+
+class OrderExportSerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the order export.
+
+    params:
+        export_format (str): "ndjson" (default) or "csv".
+        status (str, optional): Only export orders in this status.
+        created_at__gte (datetime, optional): Only export orders created at or after this time.
+        created_at__lte (datetime, optional): Only export orders created at or before this time.
+    """
+
+    export_format = serializers.ChoiceField(choices=export.FORMATS, default="ndjson")
+    status = serializers.ChoiceField(choices=stats.STATUSES, required=False)
+    created_at__gte = serializers.DateTimeField(required=False)
+    created_at__lte = serializers.DateTimeField(required=False)
+
+
+class CreateOrderBatchSerializer(serializers.Serializer):
+    """
+    Serializer to create several Orders, one per offer detail ID, in one transaction.
+
+    params:
+        offer_detail_ids (list of int): IDs of the OfferDetails to order; repeat an ID to order it twice.
+    return:
+        list of Order: Created Order instances, in the order of the IDs.
+    raise:
+        serializers.ValidationError: If any offer_detail_id does not exist.
+    """
+
+    max_batch_size = 50
+
+    offer_detail_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), min_length=1, max_length=max_batch_size
+    )
+
+    def validate_offer_detail_ids(self, value):
+        """
+        Load all requested offer details with their offers in one query.
+
+        params:
+            value (list of int): Requested offer detail IDs.
+        return:
+            list of int: The IDs unchanged.
+        raise:
+            serializers.ValidationError: If any ID does not exist.
+        """
+        self.offer_details = OfferDetails.objects.select_related("offer").in_bulk(value)
+        missing = sorted(set(value) - self.offer_details.keys())
+        if missing:
+            raise serializers.ValidationError(f"Offer details not found: {', '.join(map(str, missing))}.")
+        return value
+
+    def create(self, validated_data):
+        """
+        Insert all orders and their OrderEvents with one bulk_create each and update the
+        business users' counters.
+
+        params:
+            validated_data (dict): Data validated by serializer.
+        return:
+            list of Order: Created Order instances.
+        """
+        customer_user = self.context["request"].user
+        orders = [
+            build_order(self.offer_details[offer_detail_id], customer_user)
+            for offer_detail_id in validated_data["offer_detail_ids"]
+        ]
+        with transaction.atomic():
+            orders = Order.objects.bulk_create(orders)
+            # bulk_create sends no post_save, so the counters and events are written here.
+            for business_user_id, count in Counter(order.business_user_id for order in orders).items():
+                stats.apply_deltas(business_user_id, {"in_progress": count})
+            events.record_many([events.build(order) for order in orders])
+        return orders
+
+    def to_representation(self, instance):
+        """
+        Serialize the created orders from the values in memory.
+
+        params:
+            instance (list of Order): The created Order instances.
+        return:
+            list of dict: Serialized orders like the single create response, plus offer_detail.
+        """
+        single = CreateOrderSerializer()
+        return [{**single.to_representation(order), "offer_detail": order.offer_detail_id} for order in instance]
+
+
 class UpdateOrderStatusSerializer(serializers.ModelSerializer):
     """
     Serializer to update only the status field of an Order.
@@ -130,17 +277,17 @@ class UpdateOrderStatusSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         """
-        Update the status field of the Order.
+        Update the status field of the Order with a conditional UPDATE of status and updated_at only.
 
         params:
             instance (Order): Order instance to update.
             validated_data (dict): Data validated by serializer.
         return:
             Order: Updated Order instance.
+        raise:
+            OrderStatusConflict: If the transition is not allowed or another request changed the status first.
         """
-        instance.status = validated_data.get("status", instance.status)
-        instance.save()
-        return instance
+        return transitions.transition(instance, validated_data.get("status", instance.status))
 
     def to_representation(self, instance):
         """
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from orders_app import events
+from .serializers import OrderEventSerializer
+
+RETRY_MILLISECONDS = 3000
+KEEPALIVE_SECONDS = 15
+
+_executor = None
+
+
+def get_executor():
+    """
+    Return the worker pool for the database queries of the streams, created on first use.
+
+    return:
+        ThreadPoolExecutor: Pool sized by settings.ORDER_EVENTS_STREAM_WORKERS.
+    """
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, "ORDER_EVENTS_STREAM_WORKERS", 4)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="order-events")
+    return _executor
+
+
+def _query(func, *args):
+    """
+    Worker entry point: run func, closing database connections that are too old or broken,
+    as the request_started and request_finished handlers do for request threads.
+    """
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_query(func, *args):
+    """
+    Run a blocking database function in the stream worker pool.
+
+    The default thread_sensitive sync_to_async would queue the polls of all open streams
+    behind each other and behind other sync code on one thread.
+
+    params:
+        func (callable): Function that queries the database.
+        args: Positional arguments for func.
+    return:
+        object: Return value of func.
+    """
+    return await sync_to_async(_query, thread_sensitive=False, executor=get_executor())(func, *args)
+
+
+def get_token_user(request):
+    """
+    Return the user of the token in the Authorization header or, as EventSource cannot
+    send headers, in the token query parameter.
+
+    params:
+        request (HttpRequest): The incoming request.
+    return:
+        User or None: The authenticated user, or None without a valid token.
+    """
+    keyword, _, key = request.headers.get("Authorization", "").partition(" ")
+    if keyword != "Token":
+        key = request.GET.get("token", "")
+    if not key:
+        return None
+    try:
+        user, _ = TokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return None
+    return user
+
+
+def get_event_data(user_id, after_id):
+    """
+    Load and serialize the next events of a user.
+
+    params:
+        user_id (int): ID of the customer or business user.
+        after_id (int): Only return events with a greater ID.
+    return:
+        list of dict: Serialized events in ID order.
+    """
+    return OrderEventSerializer(events.get_events(user_id, after_id), many=True).data
+
+
+def format_event(data):
+    """
+    Encode one event as a Server-Sent Events message.
+
+    params:
+        data (dict): Serialized event.
+    return:
+        str: Message with id, event and data lines.
+    """
+    return f"id: {data['id']}\nevent: {data['kind']}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def stream_events(user_id, last_id):
+    """
+    Yield the user's new events as they are written, for ORDER_EVENTS_STREAM_TIMEOUT seconds.
+
+    New events are looked up every ORDER_EVENTS_POLL_INTERVAL seconds with one indexed query,
+    and a comment line is sent every KEEPALIVE_SECONDS to keep proxies from closing an idle
+    connection. When the stream ends, EventSource reconnects with Last-Event-ID.
+
+    params:
+        user_id (int): ID of the customer or business user.
+        last_id (int): ID of the last event the client has seen.
+    return:
+        async iterator of str: Encoded messages.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ORDER_EVENTS_STREAM_TIMEOUT
+    keepalive_at = loop.time() + KEEPALIVE_SECONDS
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+    while loop.time() < deadline:
+        batch = await run_query(get_event_data, user_id, last_id)
+        for data in batch:
+            last_id = data["id"]
+            yield format_event(data)
+        if batch:
+            keepalive_at = loop.time() + KEEPALIVE_SECONDS
+            continue
+        if loop.time() >= keepalive_at:
+            keepalive_at = loop.time() + KEEPALIVE_SECONDS
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(settings.ORDER_EVENTS_POLL_INTERVAL)
+
+
+@require_GET
+async def order_event_stream(request):
+    """
+    Push new events of the orders the user placed or received as Server-Sent Events.
+
+    Needs the ASGI entry point (core.asgi) to hold many connections open; WSGI deployments
+    use the long-poll OrderEventListView instead. Without a Last-Event-ID header or
+    last_event_id parameter only events written after connecting are sent.
+
+    params:
+        request (HttpRequest): The incoming request, authenticated with a token or a session.
+    return:
+        StreamingHttpResponse or JsonResponse: The event stream, or a 401/400 error.
+    """
+    user = await run_query(get_token_user, request)
+    if user is None:
+        session_user = await request.auser()
+        user = session_user if session_user.is_authenticated else None
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    cursor = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    if cursor is None:
+        last_id = await run_query(events.get_latest_id)
+    elif cursor.isdigit():
+        last_id = int(cursor)
+    else:
+        return JsonResponse({"detail": "Last-Event-ID must be an event ID."}, status=400)
+
+    response = StreamingHttpResponse(stream_events(user.id, last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
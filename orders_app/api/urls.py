@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework import routers
-from .views import OrderViewSet, OrderCountView, CompletedOrderCountView
+from .streams import order_event_stream
+from .views import OrderViewSet, OrderCountView, CompletedOrderCountView, OrderStatsView, OrderEventListView
 
 router = routers.SimpleRouter()
 router.register(r"orders", OrderViewSet, basename="orders")
@@ -17,4 +18,11 @@ urlpatterns = [
         CompletedOrderCountView.as_view(),
         name="completed-order-count",
     ),
+    path(
+        "order-stats/<int:business_user_id>/",
+        OrderStatsView.as_view(),
+        name="order-stats",
+    ),
+    path("order-events/", OrderEventListView.as_view(), name="order-events"),
+    path("order-events/stream/", order_event_stream, name="order-events-stream"),
 ]
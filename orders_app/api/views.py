@@ -1,19 +1,32 @@
+import math
 from rest_framework import viewsets, filters, status, permissions
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from orders_app.models import Order
+from orders_app import cache as order_cache
+from orders_app import events, export, stats, transitions
+from orders_app.models import ArchivedOrder, Order
 from .serializers import (
+    ArchivedOrderSerializer,
     OrderSerializer,
     CreateOrderSerializer,
+    CreateOrderBatchSerializer,
+    BulkOrderStatusSerializer,
+    OrderEventSerializer,
+    OrderExportSerializer,
     UpdateOrderStatusSerializer,
 )
 from rest_framework.permissions import IsAuthenticated
-from .permissions import IsCustomerOrAdmin
+from .permissions import IsBusinessUserOrAdmin, IsCustomerOrAdmin
+from .pagination import OrderCursorPagination
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -23,16 +36,24 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     queryset = Order.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OrderCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
+    filterset_fields = {
+        "status": ["exact"],
+        "created_at": ["gte", "lte"],
+    }
 
     def get_queryset(self):
         """
         Filter orders based on the authenticated user.
 
+        The list is paginated by OrderCursorPagination, which splits this OR filter into
+        two indexed subqueries.
+
         return:
             QuerySet: Orders relevant to the current user.
         """
@@ -45,7 +66,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         return:
             list: List of permission instances.
         """
-        if self.action in ["create"]:
+        if self.action in ["create", "batch"]:
             return [IsCustomerOrAdmin()]
         return [permissions.IsAuthenticated()]
 
@@ -58,8 +79,14 @@ class OrderViewSet(viewsets.ModelViewSet):
         """
         if self.action == "create":
             return CreateOrderSerializer
+        if self.action == "batch":
+            return CreateOrderBatchSerializer
+        if self.action == "bulk_status":
+            return BulkOrderStatusSerializer
         if self.action == "partial_update":
             return UpdateOrderStatusSerializer
+        if self.action == "archived":
+            return ArchivedOrderSerializer
         return OrderSerializer
 
     def get_serializer(self, *args, **kwargs):
@@ -116,6 +143,23 @@ class OrderViewSet(viewsets.ModelViewSet):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Create one order per offer detail ID in a single transaction (multi-item checkout).
+
+        params:
+            request (HttpRequest): The incoming request with offer_detail_ids.
+        return:
+            Response: List of created orders or error response.
+        raise:
+            PermissionDenied: If user is not a customer.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.to_representation(serializer.instance), status=status.HTTP_201_CREATED)
+
     def partial_update(self, request, *args, **kwargs):
         """
         Partially update the status of an order.
@@ -154,12 +198,99 @@ class OrderViewSet(viewsets.ModelViewSet):
         try:
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
+        except transitions.OrderStatusConflict as exc:
+            return Response({"detail": exc.detail}, status=exc.status_code)
         except Exception:
             return Response(
                 {"detail": "Internal server error."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=False, methods=["post"], url_path="status")
+    def bulk_status(self, request):
+        """
+        Move many of the business user's orders to a new status with one conditional UPDATE.
+
+        Orders that are not in_progress, or that belong to another business user, are
+        reported as conflicts and left unchanged.
+
+        params:
+            request (HttpRequest): The incoming request with ids and status.
+        return:
+            Response: IDs of the updated orders and of the conflicting ones.
+        """
+        user_profile = getattr(request.user, "profile", None)
+        if not user_profile or user_profile.type != "business":
+            return Response(
+                {"detail": "Only business users are allowed to update order status."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        with transaction.atomic():
+            updated = transitions.bulk_transition(
+                Order.objects.filter(pk__in=ids, business_user=request.user), serializer.validated_data["status"]
+            )
+        conflicts = sorted(set(ids) - set(updated))
+        return Response({"updated": updated, "conflicts": conflicts}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="archive")
+    def archived(self, request):
+        """
+        List the user's archived orders, newest first, with the filters and pagination of the list.
+
+        Archived orders live in their own table, so they are not part of the regular list
+        and are only read when this endpoint is requested.
+
+        params:
+            request (HttpRequest): The incoming request.
+        return:
+            Response: One page of archived orders.
+        """
+        queryset = ArchivedOrder.objects.filter(Q(customer_user=request.user) | Q(business_user=request.user))
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Stream all orders received by the business user, archived ones included, as NDJSON or CSV.
+
+        Rows are read in chunks and encoded one by one while the response is sent, so memory
+        use does not grow with the number of orders.
+
+        params:
+            request (HttpRequest): The incoming request with export_format, status,
+                created_at__gte and created_at__lte query parameters.
+        return:
+            StreamingHttpResponse or Response: The export, or an error response.
+        """
+        user_profile = getattr(request.user, "profile", None)
+        if not user_profile or user_profile.type != "business":
+            return Response(
+                {"detail": "Only business users are allowed to export orders."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = OrderExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        rows = export.get_rows(
+            request.user.id,
+            status=params.get("status"),
+            since=params.get("created_at__gte"),
+            until=params.get("created_at__lte"),
+        )
+        export_format = params["export_format"]
+        response = StreamingHttpResponse(
+            export.encode(rows, export_format), content_type=export.CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders-{request.user.id}.{export_format}"'
+        return response
+
     def handle_exception(self, exc):
         """
         Handle exceptions for the viewset.
@@ -189,6 +320,8 @@ class OrderCountView(APIView):
         """
         Retrieve the number of active orders for a given business user.
 
+        Reads the materialized counter row; the user table is only checked when there is none.
+
         params:
             request (HttpRequest): The request object.
             business_user_id (int): ID of the business user.
@@ -197,8 +330,10 @@ class OrderCountView(APIView):
         raise:
             Http404: If the business user is not found.
         """
-        business_user = get_object_or_404(User, id=business_user_id)
-        order_count = Order.objects.filter(business_user=business_user, status="in_progress").count()
+        order_count = stats.get_count(business_user_id, "in_progress")
+        if order_count is None:
+            get_object_or_404(User, id=business_user_id)
+            order_count = 0
         return Response({"order_count": order_count}, status=status.HTTP_200_OK)
 
 
@@ -213,6 +348,8 @@ class CompletedOrderCountView(APIView):
         """
         Retrieve the number of completed orders for a given business user.
 
+        Reads the materialized counter row; the user table is only checked when there is none.
+
         params:
             request (HttpRequest): The request object.
             business_user_id (int): ID of the business user.
@@ -221,9 +358,88 @@ class CompletedOrderCountView(APIView):
         raise:
             Http404: If the business user is not found.
         """
-        business_user = get_object_or_404(User, id=business_user_id)
-        completed_order_count = Order.objects.filter(business_user=business_user, status="completed").count()
+        completed_order_count = stats.get_count(business_user_id, "completed")
+        if completed_order_count is None:
+            get_object_or_404(User, id=business_user_id)
+            completed_order_count = 0
         return Response(
             {"completed_order_count": completed_order_count},
             status=status.HTTP_200_OK,
         )
+
+
+class OrderStatsView(APIView):
+    """
+    API endpoint to get order counts and revenue per status for a business user.
+
+    Revenue is private: only the business user themself and admins may read it.
+    """
+
+    permission_classes = [IsBusinessUserOrAdmin]
+
+    def get(self, request, business_user_id):
+        """
+        Retrieve counts and summed prices of in_progress, completed and cancelled orders.
+
+        The summary comes from one grouped aggregate and is cached until an order of the
+        business user is written.
+
+        params:
+            request (HttpRequest): The request object.
+            business_user_id (int): ID of the business user.
+        return:
+            Response: JSON with count and revenue per status and in total.
+        raise:
+            PermissionDenied: If the user is neither the business user nor an admin.
+            Http404: If the business user is not found.
+        """
+        data = order_cache.get_summary(business_user_id)
+        if data is None:
+            summary = stats.get_summary(business_user_id)
+            if not summary["total"]["count"]:
+                get_object_or_404(User, id=business_user_id)
+            data = {"business_user": business_user_id, **summary}
+            order_cache.set_summary(business_user_id, data)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class OrderEventListView(APIView):
+    """
+    Long-poll feed of order events for WSGI deployments, where the event stream is unavailable.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Return the events after a cursor, waiting until one arrives or the timeout expires.
+
+        Without ?after the feed starts at the newest event; clients pass the returned
+        last_event_id as ?after of the next request. ?timeout sets the wait in seconds,
+        at most ORDER_EVENTS_LONG_POLL_TIMEOUT.
+
+        params:
+            request (HttpRequest): The request object with after and timeout parameters.
+        return:
+            Response: JSON with the events and last_event_id, or a 400 error.
+        """
+        try:
+            after = int(request.query_params.get("after", events.get_latest_id()))
+            timeout = float(request.query_params.get("timeout", settings.ORDER_EVENTS_LONG_POLL_TIMEOUT))
+            if not math.isfinite(timeout):
+                raise ValueError(timeout)
+        except ValueError:
+            return Response(
+                {"detail": "after must be an event ID and timeout a number of seconds."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        timeout = min(max(timeout, 0), settings.ORDER_EVENTS_LONG_POLL_TIMEOUT)
+
+        found = events.wait_for_events(request.user.id, after, timeout, settings.ORDER_EVENTS_POLL_INTERVAL)
+        return Response(
+            {
+                "events": OrderEventSerializer(found, many=True).data,
+                "last_event_id": found[-1].id if found else after,
+            },
+            status=status.HTTP_200_OK,
+        )
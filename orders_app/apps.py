@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OrdersAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "orders_app"
+
+    def ready(self):
+        from orders_app import signals  # noqa: F401
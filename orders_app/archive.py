@@ -0,0 +1,52 @@
+from django.db import transaction
+from orders_app import stats
+from orders_app.models import ArchivedOrder, Order
+
+TERMINAL_STATUSES = ("completed", "cancelled")
+FIELDS = [field.attname for field in ArchivedOrder._meta.concrete_fields if field.name != "archived_at"]
+
+
+def get_candidates(cutoff, statuses=TERMINAL_STATUSES):
+    """
+    Return the orders that may be archived: in a terminal status and unchanged since cutoff.
+
+    params:
+        cutoff (datetime): Orders updated at or after this time stay in Order.
+        statuses (tuple of str): Statuses to archive, a subset of TERMINAL_STATUSES.
+    return:
+        QuerySet: Archivable orders.
+    """
+    return Order.objects.filter(status__in=statuses, updated_at__lt=cutoff)
+
+
+def archive_batch(cutoff, after_id=0, batch_size=500, statuses=TERMINAL_STATUSES):
+    """
+    Move the next batch of archivable orders, by ascending ID, to ArchivedOrder.
+
+    Copying and deleting happen in one transaction, so an interrupted run leaves every
+    order in exactly one of the two tables and the next run simply continues. The
+    counters are not touched: archived orders still count for their business user.
+
+    params:
+        cutoff (datetime): Orders updated at or after this time stay in Order.
+        after_id (int): Only consider orders with a greater ID, the last ID of the previous batch.
+        batch_size (int): Maximum number of orders to move.
+        statuses (tuple of str): Statuses to archive, a subset of TERMINAL_STATUSES.
+    return:
+        list of int: IDs of the moved orders, ascending.
+    """
+    with transaction.atomic():
+        rows = list(
+            get_candidates(cutoff, statuses)
+            .filter(pk__gt=after_id)
+            .select_for_update()
+            .order_by("pk")
+            .values(*FIELDS)[:batch_size]
+        )
+        if not rows:
+            return []
+        ids = [row["id"] for row in rows]
+        ArchivedOrder.objects.bulk_create([ArchivedOrder(**row) for row in rows])
+        with stats.suspended():
+            Order.objects.filter(pk__in=ids).delete()
+    return ids
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+from base_app import cache_versions
+
+STATS_VERSION_KEY = "orders:version:stats:{}"
+
+
+def get_timeout():
+    """
+    Return how long cached order summaries live, in seconds.
+
+    return:
+        int: Value of settings.ORDERS_CACHE_TIMEOUT, 300 by default.
+    """
+    return getattr(settings, "ORDERS_CACHE_TIMEOUT", 300)
+
+
+def bump_stats_version(business_user_id):
+    """
+    Invalidate the cached order summary of one business user.
+
+    params:
+        business_user_id (int): ID of the business user.
+    """
+    cache_versions.bump_version(STATS_VERSION_KEY.format(business_user_id))
+
+
+def get_summary_key(business_user_id):
+    """
+    Build the cache key of a business user's order summary.
+
+    params:
+        business_user_id (int): ID of the business user.
+    return:
+        str: Cache key including the business user's stats version.
+    """
+    version = cache_versions.get_version(STATS_VERSION_KEY.format(business_user_id))
+    return f"orders:summary:{business_user_id}:{version}"
+
+
+def get_summary(business_user_id):
+    """
+    Look up a cached order summary.
+
+    params:
+        business_user_id (int): ID of the business user.
+    return:
+        dict or None: Cached summary.
+    """
+    return cache.get(get_summary_key(business_user_id))
+
+
+def set_summary(business_user_id, data):
+    """
+    Store an order summary for get_timeout() seconds.
+
+    params:
+        business_user_id (int): ID of the business user.
+        data (dict): Summary data.
+    """
+    cache.set(get_summary_key(business_user_id), data, get_timeout())
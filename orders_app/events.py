@@ -0,0 +1,92 @@
+import time
+from django.db.models import Max, Q
+from orders_app.models import OrderEvent
+
+PAGE_SIZE = 100
+
+
+def build(order, old_status=None):
+    """
+    Build an unsaved event for a new order, or for a status change if old_status is given.
+
+    params:
+        order (Order): The order, with its current status.
+        old_status (str, optional): Status before the change.
+    return:
+        OrderEvent: Unsaved event.
+    """
+    return OrderEvent(
+        order_id=order.pk,
+        customer_user_id=order.customer_user_id,
+        business_user_id=order.business_user_id,
+        kind=OrderEvent.CREATED if old_status is None else OrderEvent.STATUS_CHANGED,
+        status=order.status,
+        old_status=old_status,
+    )
+
+
+def record(order, old_status=None):
+    """
+    Append one event for a new order or a status change.
+
+    params:
+        order (Order): The order, with its current status.
+        old_status (str, optional): Status before the change, None for a new order.
+    """
+    build(order, old_status).save()
+
+
+def record_many(events):
+    """
+    Append several unsaved events with one INSERT.
+
+    params:
+        events (list of OrderEvent): Events from build().
+    """
+    OrderEvent.objects.bulk_create(events)
+
+
+def get_latest_id():
+    """
+    return:
+        int: ID of the newest event, 0 if there is none.
+    """
+    return OrderEvent.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def get_events(user_id, after_id, limit=PAGE_SIZE):
+    """
+    Return the events of orders a user placed or received, after a cursor, oldest first.
+
+    params:
+        user_id (int): ID of the customer or business user.
+        after_id (int): Only return events with a greater ID.
+        limit (int): Maximum number of events.
+    return:
+        list of OrderEvent: Events in ID order.
+    """
+    return list(
+        OrderEvent.objects.filter(Q(customer_user_id=user_id) | Q(business_user_id=user_id), id__gt=after_id).order_by(
+            "id"
+        )[:limit]
+    )
+
+
+def wait_for_events(user_id, after_id, timeout, interval):
+    """
+    Return new events as soon as there are any, checking every interval seconds until timeout.
+
+    params:
+        user_id (int): ID of the customer or business user.
+        after_id (int): Only return events with a greater ID.
+        timeout (float): Maximum number of seconds to wait.
+        interval (float): Seconds between two checks.
+    return:
+        list of OrderEvent: Events in ID order, empty if none arrived in time.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        events = get_events(user_id, after_id)
+        if events or time.monotonic() + interval > deadline:
+            return events
+        time.sleep(interval)
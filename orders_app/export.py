@@ -0,0 +1,112 @@
+import csv
+import heapq
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from orders_app.models import ArchivedOrder, Order
+
+FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+FIELDS = [
+    "id",
+    "customer_user_id",
+    "business_user_id",
+    "offer_detail_id",
+    "title",
+    "revisions",
+    "delivery_time_in_days",
+    "price",
+    "features",
+    "offer_type",
+    "status",
+    "created_at",
+    "updated_at",
+]
+CHUNK_SIZE = 2000
+
+
+def get_rows(business_user_id, status=None, since=None, until=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the orders received by a business user, oldest first, as dicts of FIELDS.
+
+    Order and ArchivedOrder are each read with values().iterator() on their
+    (business_user, created_at, id) index and merged lazily, so only about one chunk
+    per table is held in memory however many orders there are.
+
+    params:
+        business_user_id (int): ID of the business user.
+        status (str, optional): Only export orders in this status.
+        since (datetime, optional): Only export orders created at or after this time.
+        until (datetime, optional): Only export orders created at or before this time.
+        chunk_size (int): Rows fetched from the database at a time.
+    return:
+        iterator of dict: One dict per order.
+    """
+    filters = {"business_user_id": business_user_id}
+    if status:
+        filters["status"] = status
+    if since:
+        filters["created_at__gte"] = since
+    if until:
+        filters["created_at__lte"] = until
+    tables = [
+        model.objects.filter(**filters).order_by("created_at", "id").values(*FIELDS).iterator(chunk_size=chunk_size)
+        for model in (Order, ArchivedOrder)
+    ]
+    return heapq.merge(*tables, key=lambda row: (row["created_at"], row["id"]))
+
+
+def iter_ndjson(rows):
+    """
+    Encode rows as newline-delimited JSON, one line per row.
+
+    params:
+        rows (iterable of dict): Rows from get_rows.
+    return:
+        iterator of str: Encoded lines.
+    """
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value instead of storing it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """
+    Encode rows as CSV with a header line; features are written as a JSON list and
+    timestamps like in the NDJSON export.
+
+    params:
+        rows (iterable of dict): Rows from get_rows.
+    return:
+        iterator of str: Encoded lines.
+    """
+    writer = csv.writer(_Echo())
+    encoder = DjangoJSONEncoder()
+    yield writer.writerow(FIELDS)
+    for row in rows:
+        row["features"] = json.dumps(row["features"])
+        row["created_at"] = encoder.default(row["created_at"])
+        row["updated_at"] = encoder.default(row["updated_at"])
+        yield writer.writerow([row[field] for field in FIELDS])
+
+
+def encode(rows, export_format):
+    """
+    Encode rows in one of FORMATS.
+
+    params:
+        rows (iterable of dict): Rows from get_rows.
+        export_format (str): "ndjson" or "csv".
+    return:
+        iterator of str: Encoded lines.
+    """
+    if export_format == "csv":
+        return iter_csv(rows)
+    return iter_ndjson(rows)
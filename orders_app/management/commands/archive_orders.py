@@ -0,0 +1,58 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from orders_app import archive
+
+
+class Command(BaseCommand):
+    """
+    Move finished orders from Order to ArchivedOrder in small transactions.
+    """
+
+    help = "Archive completed and cancelled orders that have not changed for a number of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ORDERS_ARCHIVE_AFTER_DAYS,
+            help="Archive orders last updated more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Orders moved per transaction.")
+        parser.add_argument(
+            "--status",
+            nargs="+",
+            choices=archive.TERMINAL_STATUSES,
+            default=list(archive.TERMINAL_STATUSES),
+            help="Only archive orders in these statuses.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Archive matching orders batch by batch until none are left.
+
+        Every batch is committed on its own, so the command can be stopped at any time and
+        run again later to continue.
+
+        params:
+            options (dict): Parsed command line options.
+        raise:
+            CommandError: If --days is negative or --batch-size is not positive.
+        """
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        statuses = tuple(options["status"])
+        last_id, total = 0, 0
+        while True:
+            ids = archive.archive_batch(cutoff, last_id, options["batch_size"], statuses)
+            if not ids:
+                break
+            last_id = ids[-1]
+            total += len(ids)
+            self.stdout.write(f"Archived {total} orders (up to id {last_id}).")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} orders updated before {cutoff.isoformat()}."))
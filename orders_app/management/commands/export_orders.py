@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from orders_app import export, stats
+
+
+class Command(BaseCommand):
+    """
+    Write all orders of a business user, archived ones included, as NDJSON or CSV.
+    """
+
+    help = "Export the orders received by a business user, oldest first."
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_user_id", type=int, help="ID of the business user.")
+        parser.add_argument("--format", choices=export.FORMATS, default="ndjson", help="Output format.")
+        parser.add_argument("--status", choices=stats.STATUSES, help="Only export orders in this status.")
+        parser.add_argument("--since", help="Only export orders created at or after this ISO 8601 time.")
+        parser.add_argument("--until", help="Only export orders created at or before this ISO 8601 time.")
+        parser.add_argument("--output", help="File to write to instead of standard output.")
+        parser.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE, help="Rows read at a time.")
+
+    def parse_time(self, value, option):
+        """
+        Parse an optional ISO 8601 date or time given on the command line, in the current
+        time zone unless it has an offset.
+
+        params:
+            value (str or None): Raw option value.
+            option (str): Option name, for the error message.
+        return:
+            datetime or None: Parsed time.
+        raise:
+            CommandError: If the value is not a valid time.
+        """
+        if value is None:
+            return None
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f"{option} must be an ISO 8601 date or time.")
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    def handle(self, *args, **options):
+        """
+        Stream the matching orders to the output, one encoded row at a time.
+
+        params:
+            options (dict): Parsed command line options.
+        raise:
+            CommandError: If the user does not exist or an option is invalid.
+        """
+        if not User.objects.filter(pk=options["business_user_id"]).exists():
+            raise CommandError(f"User {options['business_user_id']} does not exist.")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        rows = export.get_rows(
+            options["business_user_id"],
+            status=options["status"],
+            since=self.parse_time(options["since"], "--since"),
+            until=self.parse_time(options["until"], "--until"),
+            chunk_size=options["chunk_size"],
+        )
+        lines = export.encode(rows, options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from orders_app import stats
+
+
+class Command(BaseCommand):
+    """
+    Reconcile the materialized OrderStats counters with the Order table.
+    """
+
+    help = "Recompute the per-business order counters from Order."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", nargs="+", type=int, help="Only rebuild the counters of these business users.")
+
+    def handle(self, *args, **options):
+        """
+        Recount orders per business user and status and overwrite the stored counters.
+
+        params:
+            options (dict): Parsed command line options.
+        """
+        written, out_of_sync = stats.rebuild(options["users"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt order stats for {written} business users, {out_of_sync} were out of sync.")
+        )
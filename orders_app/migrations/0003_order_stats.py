@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-17 03:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_order_stats(apps, schema_editor):
+    Order = apps.get_model('orders_app', 'Order')
+    OrderStats = apps.get_model('orders_app', 'OrderStats')
+    statuses = ['in_progress', 'completed', 'cancelled']
+    rows = (
+        Order.objects.order_by()
+        .values('business_user_id')
+        .annotate(**{status: Count('pk', filter=Q(status=status)) for status in statuses})
+    )
+    OrderStats.objects.bulk_create([OrderStats(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('orders_app', '0002_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_order_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-17 03:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offerdetails_updated_at'),
+        ('orders_app', '0004_order_created_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('revisions', models.IntegerField()),
+                ('delivery_time_in_days', models.IntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('features', models.JSONField(default=list)),
+                ('offer_type', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_business', to=settings.AUTH_USER_MODEL)),
+                ('customer_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders_as_customer', to=settings.AUTH_USER_MODEL)),
+                ('offer_detail', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='offers_app.offerdetails')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['customer_user', 'created_at', 'id'], name='archived_customer_created_idx'), models.Index(fields=['business_user', 'created_at', 'id'], name='archived_business_created_idx')],
+            },
+        ),
+    ]
@@ -20,3 +20,93 @@ class Order(models.Model):
     status = models.CharField(max_length=20, default="in_progress")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business_user", "status"], name="order_business_status_idx"),
+            models.Index(fields=["customer_user", "status"], name="order_customer_status_idx"),
+            models.Index(fields=["customer_user", "created_at", "id"], name="order_customer_created_idx"),
+            models.Index(fields=["business_user", "created_at", "id"], name="order_business_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the status as loaded, so a later save can tell whether it changed.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "status" in instance.__dict__:
+            instance._loaded_status = instance.status
+        return instance
+
+
+class OrderStats(models.Model):
+    """
+    Materialized number of orders per status for one business user.
+
+    Kept in sync by orders_app.stats; rebuild_order_stats recomputes it from Order and ArchivedOrder.
+    """
+
+    business_user = models.OneToOneField(User, primary_key=True, related_name="order_stats", on_delete=models.CASCADE)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class ArchivedOrder(models.Model):
+    """
+    A finished order moved out of the Order table by the archive_orders command.
+
+    Keeps the ID and all columns of the original order. Archived orders still count in
+    OrderStats, so moving an order here leaves the counters unchanged.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(User, related_name="archived_orders_as_customer", on_delete=models.CASCADE)
+    business_user = models.ForeignKey(User, related_name="archived_orders_as_business", on_delete=models.CASCADE)
+    offer_detail = models.ForeignKey("offers_app.OfferDetails", null=True, on_delete=models.SET_NULL)
+
+    title = models.CharField(max_length=255)
+    revisions = models.IntegerField()
+    delivery_time_in_days = models.IntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["customer_user", "created_at", "id"], name="archived_customer_created_idx"),
+            models.Index(fields=["business_user", "created_at", "id"], name="archived_business_created_idx"),
+        ]
+
+
+class OrderEvent(models.Model):
+    """
+    Append-only log entry for an order being created or changing status.
+
+    Its ID is the cursor of the event feeds. order_id is a plain column, so events
+    outlive archived and deleted orders.
+    """
+
+    CREATED = "created"
+    STATUS_CHANGED = "status_changed"
+    KIND_CHOICES = [(CREATED, "Created"), (STATUS_CHANGED, "Status changed")]
+
+    order_id = models.BigIntegerField()
+    customer_user = models.ForeignKey(User, related_name="order_events_as_customer", on_delete=models.CASCADE)
+    business_user = models.ForeignKey(User, related_name="order_events_as_business", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20)
+    old_status = models.CharField(max_length=20, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["customer_user", "id"], name="order_event_customer_idx"),
+            models.Index(fields=["business_user", "id"], name="order_event_business_idx"),
+        ]
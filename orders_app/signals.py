@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from orders_app import cache as order_cache
+from orders_app import events, stats
+from orders_app.models import Order
+
+
+@receiver(post_save, sender=Order)
+def record_saved_order(sender, instance, created, **kwargs):
+    """
+    Update the business user's status counters and append an OrderEvent for a new order
+    or a status change.
+
+    The status loaded from the database is the baseline, so saves that keep the status
+    cost no query; they only invalidate the cached order summary.
+
+    params:
+        sender (type): The Order model class.
+        instance (Order): The saved order.
+        created (bool): Whether the order was inserted.
+    """
+    if stats.is_suspended():
+        return
+    old_status = None if created else getattr(instance, "_loaded_status", instance.status)
+    if old_status == instance.status:
+        # Counters are unchanged, but the summary's revenue may be, e.g. after a price edit.
+        order_cache.bump_stats_version(instance.business_user_id)
+    else:
+        stats.record_status_change(instance.business_user_id, old_status, instance.status)
+        events.record(instance, old_status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, **kwargs):
+    """
+    Remove a deleted order from its business user's status counters.
+
+    params:
+        sender (type): The Order model class.
+        instance (Order): The deleted order.
+    """
+    if stats.is_suspended():
+        return
+    stats.record_status_change(instance.business_user_id, getattr(instance, "_loaded_status", instance.status), None)
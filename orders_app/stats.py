@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import partial
+from django.db.models import Count, F, Q, Sum
+from base_app import counters
+from orders_app import cache as order_cache
+from orders_app.models import ArchivedOrder, Order, OrderStats
+
+STATUSES = ("in_progress", "completed", "cancelled")
+
+_suspended = ContextVar("order_stats_suspended", default=False)
+
+
+@contextmanager
+def suspended():
+    """
+    Skip the counter updates of the Order signals inside the block.
+
+    For writes that move orders without changing what they count for, such as archiving.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def is_suspended():
+    """
+    return:
+        bool: Whether counter updates are currently suspended.
+    """
+    return _suspended.get()
+
+
+def count_orders(business_user_id):
+    """
+    Count the orders of one business user per status, straight from Order and ArchivedOrder.
+
+    params:
+        business_user_id (int): ID of the business user.
+    return:
+        dict: Status mapped to number of orders.
+    """
+    counts = dict.fromkeys(STATUSES, 0)
+    for model in (Order, ArchivedOrder):
+        row = model.objects.filter(business_user_id=business_user_id).aggregate(
+            **{status: Count("pk", filter=Q(status=status)) for status in STATUSES}
+        )
+        for status in STATUSES:
+            counts[status] += row[status]
+    return counts
+
+
+def apply_deltas(business_user_id, deltas):
+    """
+    Add per-status deltas to a business user's counters in one UPDATE with F() expressions.
+
+    Call after the orders themselves were written, in the same transaction; the cached order
+    summary of the user is invalidated as well. If the user has
+    no counter row yet and a counter grows, the row is created from a recount of the orders,
+    which already includes the change.
+
+    params:
+        business_user_id (int): ID of the business user.
+        deltas (dict): Status mapped to the change of its counter; unknown statuses are ignored.
+    """
+    changes = {status: F(status) + delta for status, delta in deltas.items() if status in STATUSES and delta}
+    if not changes:
+        return
+    order_cache.bump_stats_version(business_user_id)
+    counters.update_or_recount(
+        OrderStats,
+        {"business_user_id": business_user_id},
+        changes,
+        partial(count_orders, business_user_id),
+        create=any(deltas[status] > 0 for status in changes),
+    )
+
+
+def record_status_change(business_user_id, old_status=None, new_status=None):
+    """
+    Move one order between status counters.
+
+    params:
+        business_user_id (int): ID of the business user.
+        old_status (str, optional): Previous status, None for a new order.
+        new_status (str, optional): New status, None for a deleted order.
+    """
+    if old_status == new_status:
+        return
+    deltas = {}
+    if old_status is not None:
+        deltas[old_status] = -1
+    if new_status is not None:
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    apply_deltas(business_user_id, deltas)
+
+
+def get_count(business_user_id, status):
+    """
+    Read one counter with a single-row query.
+
+    params:
+        business_user_id (int): ID of the business user.
+        status (str): One of STATUSES.
+    return:
+        int or None: Number of orders, or None if the user has no counter row.
+    """
+    return OrderStats.objects.filter(business_user_id=business_user_id).values_list(status, flat=True).first()
+
+
+def get_summary(business_user_id):
+    """
+    Count orders and sum their price per status with one grouped aggregate over Order and,
+    like the counters, one over ArchivedOrder.
+
+    params:
+        business_user_id (int): ID of the business user.
+    return:
+        dict: Status mapped to {"count", "revenue"} plus a "total" entry.
+    """
+    rows = {}
+    for model in (Order, ArchivedOrder):
+        grouped = (
+            model.objects.filter(business_user_id=business_user_id)
+            .order_by()
+            .values("status")
+            .annotate(count=Count("pk"), revenue=Sum("price"))
+        )
+        for row in grouped:
+            merged = rows.setdefault(row["status"], {"count": 0, "revenue": Decimal(0)})
+            merged["count"] += row["count"]
+            merged["revenue"] += row["revenue"] or Decimal(0)
+    summary = {}
+    for status in STATUSES:
+        row = rows.get(status, {})
+        summary[status] = {"count": row.get("count", 0), "revenue": _format_amount(row.get("revenue"))}
+    summary["total"] = {
+        "count": sum(row["count"] for row in rows.values()),
+        "revenue": _format_amount(sum((row["revenue"] for row in rows.values()), Decimal(0))),
+    }
+    return summary
+
+
+def _format_amount(value):
+    """
+    Format a sum of prices like the price field of the order API.
+
+    params:
+        value (Decimal or None): Sum of prices.
+    return:
+        str: Amount with two decimal places.
+    """
+    return str((value or Decimal(0)).quantize(Decimal("0.01")))
+
+
+def rebuild(business_user_ids=None):
+    """
+    Recompute counters from Order and ArchivedOrder with one grouped query each and write them
+    back in one transaction, see counters.replace_all.
+
+    params:
+        business_user_ids (list of int, optional): Limit the rebuild to these business users.
+    return:
+        tuple: (number of counter rows written, number of rows that were out of sync)
+    """
+    stats = OrderStats.objects.all()
+    if business_user_ids:
+        stats = stats.filter(business_user_id__in=business_user_ids)
+
+    expected = {}
+    for model in (Order, ArchivedOrder):
+        orders = model.objects.all()
+        if business_user_ids:
+            orders = orders.filter(business_user_id__in=business_user_ids)
+        rows = (
+            orders.order_by()
+            .values("business_user_id")
+            .annotate(**{status: Count("pk", filter=Q(status=status)) for status in STATUSES})
+        )
+        for row in rows:
+            counts = expected.setdefault(row.pop("business_user_id"), dict.fromkeys(STATUSES, 0))
+            for status in STATUSES:
+                counts[status] += row[status]
+
+    return counters.replace_all(stats, "business_user", expected, dict.fromkeys(STATUSES, 0))
@@ -1,3 +1,463 @@
-from django.test import TestCase
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+from auth_app.models import Profile
+from offers_app.models import Offer, OfferDetails
+from orders_app import transitions
+from orders_app.models import ArchivedOrder, Order, OrderEvent, OrderStats
 
-# Create your tests here.
+
+def create_order(customer, business, status="in_progress"):
+    offer = Offer.objects.create(user=business, title="Offer", description="Offer")
+    detail = OfferDetails.objects.create(offer=offer, price=100, delivery_time_in_days=3)
+    return Order.objects.create(
+        customer_user=customer,
+        business_user=business,
+        offer_detail=detail,
+        title=offer.title,
+        revisions=0,
+        delivery_time_in_days=3,
+        price=100,
+        offer_type="basic",
+        status=status,
+    )
+
+
+class OrderStatsTests(APITestCase):
+    """
+    Materialized per-business order counters.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="customer")
+        self.business = User.objects.create(username="business")
+        Profile.objects.create(user=self.business, type="business", email="business@example.com")
+        self.client.force_authenticate(self.business)
+
+    def get_stats(self):
+        return OrderStats.objects.values("in_progress", "completed", "cancelled").get(business_user=self.business)
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        first = create_order(self.customer, self.business)
+        create_order(self.customer, self.business)
+        self.assertEqual(self.get_stats(), {"in_progress": 2, "completed": 0, "cancelled": 0})
+
+        response = self.client.patch(reverse("orders-detail", args=[first.id]), {"status": "completed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_stats(), {"in_progress": 1, "completed": 1, "cancelled": 0})
+
+        Order.objects.get(pk=first.id).delete()
+        self.assertEqual(self.get_stats(), {"in_progress": 1, "completed": 0, "cancelled": 0})
+
+    def test_count_views_read_one_row(self):
+        create_order(self.customer, self.business)
+        create_order(self.customer, self.business, status="completed")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("order-count", args=[self.business.id]))
+        self.assertEqual(response.data, {"order_count": 1})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("completed-order-count", args=[self.business.id]))
+        self.assertEqual(response.data, {"completed_order_count": 1})
+
+        response = self.client.get(reverse("order-count", args=[self.customer.id]))
+        self.assertEqual(response.data, {"order_count": 0})
+        response = self.client.get(reverse("order-count", args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_rebuild_command_repairs_drift(self):
+        create_order(self.customer, self.business)
+        OrderStats.objects.filter(business_user=self.business).update(in_progress=7, cancelled=2)
+
+        output = StringIO()
+        call_command("rebuild_order_stats", stdout=output)
+        self.assertIn("1 were out of sync", output.getvalue())
+        self.assertEqual(self.get_stats(), {"in_progress": 1, "completed": 0, "cancelled": 0})
+
+    def test_summary_groups_counts_and_revenue_and_is_cached(self):
+        create_order(self.customer, self.business)
+        create_order(self.customer, self.business, status="completed")
+        url = reverse("order-stats", args=[self.business.id])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["in_progress"], {"count": 1, "revenue": "100.00"})
+        self.assertEqual(response.data["cancelled"], {"count": 0, "revenue": "0.00"})
+        self.assertEqual(response.data["total"], {"count": 2, "revenue": "200.00"})
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        create_order(self.customer, self.business, status="cancelled")
+        response = self.client.get(url)
+        self.assertEqual(response.data["cancelled"], {"count": 1, "revenue": "100.00"})
+
+    def test_summary_is_only_visible_to_the_business_user_and_staff(self):
+        create_order(self.customer, self.business)
+        url = reverse("order-stats", args=[self.business.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(reverse("order-stats", args=[999999])).status_code, 403)
+
+        self.client.force_authenticate(User.objects.create(username="admin", is_staff=True))
+        self.assertEqual(self.client.get(url).data["total"]["count"], 1)
+        self.assertEqual(self.client.get(reverse("order-stats", args=[999999])).status_code, 404)
+
+
+class OrderListPaginationTests(APITestCase):
+    """
+    Keyset pagination of a user's placed and received orders.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username="trader")
+        self.other = User.objects.create(username="other")
+        self.orders = [create_order(self.user, self.other) for _ in range(3)]
+        self.orders += [create_order(self.other, self.user, status="completed") for _ in range(3)]
+        create_order(self.other, self.other)
+        self.client.force_authenticate(self.user)
+
+    def collect(self, params):
+        ids = []
+        url = reverse("orders-list")
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            ids += [order["id"] for order in response.data["results"]]
+            url, params = response.data["next"], None
+        return ids
+
+    def test_walks_both_sides_newest_first(self):
+        expected = sorted(self.orders, key=lambda order: (order.created_at, order.id), reverse=True)
+        self.assertEqual(self.collect({"page_size": 2}), [order.id for order in expected])
+
+    def test_filters_by_status_and_created_at(self):
+        completed = [order.id for order in reversed(self.orders[3:])]
+        self.assertEqual(self.collect({"status": "completed", "page_size": 2}), completed)
+
+        since = self.orders[4].created_at.isoformat()
+        self.assertEqual(self.collect({"created_at__gte": since}), [self.orders[5].id, self.orders[4].id])
+
+
+class OrderBatchCreateTests(APITestCase):
+    """
+    Multi-item checkout through POST /api/orders/batch/.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="shopper")
+        Profile.objects.create(user=self.customer, type="customer", email="shopper@example.com")
+        self.businesses = [User.objects.create(username=f"seller{index}") for index in range(2)]
+        self.details = []
+        for business in self.businesses:
+            offer = Offer.objects.create(user=business, title=f"{business.username} offer", description="Offer")
+            self.details += [OfferDetails.objects.create(offer=offer, price=price) for price in (10, 20)]
+        self.client.force_authenticate(self.customer)
+
+    def checkout(self, ids):
+        return self.client.post(reverse("orders-batch"), {"offer_detail_ids": ids}, format="json")
+
+    def test_creates_all_orders_and_updates_counters(self):
+        ids = [detail.id for detail in self.details] + [self.details[0].id]
+        response = self.checkout(ids)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([order["offer_detail"] for order in response.data], ids)
+        self.assertEqual(response.data[0]["business_user"], self.businesses[0].id)
+        self.assertEqual(response.data[0]["title"], "seller0 offer")
+        self.assertEqual(
+            dict(OrderStats.objects.values_list("business_user_id", "in_progress")),
+            {self.businesses[0].id: 3, self.businesses[1].id: 2},
+        )
+
+    def test_query_count_does_not_grow_with_items(self):
+        self.checkout([self.details[0].id])
+        with CaptureQueriesContext(connection) as few:
+            self.checkout([self.details[0].id])
+        with CaptureQueriesContext(connection) as many:
+            self.checkout([self.details[0].id] * 20)
+        self.assertEqual(len(many), len(few))
+
+    def test_rejects_unknown_ids_without_creating_orders(self):
+        response = self.checkout([self.details[0].id, 999999])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+
+
+class OrderStatusTransitionTests(APITestCase):
+    """
+    Conditional single and bulk order status transitions.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="buyer")
+        self.business = User.objects.create(username="maker")
+        Profile.objects.create(user=self.business, type="business", email="maker@example.com")
+        self.client.force_authenticate(self.business)
+
+    def test_transition_writes_only_status_and_rejects_stale_or_invalid_changes(self):
+        order = create_order(self.customer, self.business)
+        stale = Order.objects.get(pk=order.pk)
+        Order.objects.filter(pk=order.pk).update(features=["kept"])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.patch(reverse("orders-detail", args=[order.id]), {"status": "completed"})
+        self.assertEqual(response.status_code, 200)
+        update = next(query["sql"] for query in captured if query["sql"].startswith('UPDATE "orders_app_order"'))
+        self.assertNotIn("features", update)
+        self.assertEqual(Order.objects.get(pk=order.pk).features, ["kept"])
+
+        response = self.client.patch(reverse("orders-detail", args=[order.id]), {"status": "in_progress"})
+        self.assertEqual(response.status_code, 409)
+
+        with self.assertRaises(transitions.OrderStatusConflict):
+            transitions.transition(stale, "cancelled")
+        self.assertEqual(Order.objects.get(pk=order.pk).status, "completed")
+
+    def test_transition_rolls_back_when_a_follow_up_write_fails(self):
+        order = create_order(self.customer, self.business)
+        with mock.patch("orders_app.events.record", side_effect=RuntimeError):
+            response = self.client.patch(reverse("orders-detail", args=[order.id]), {"status": "completed"})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(Order.objects.get(pk=order.pk).status, "in_progress")
+        self.assertEqual(OrderStats.objects.get(business_user=self.business).completed, 0)
+
+    def test_bulk_transition_ignores_rows_written_at_the_same_time(self):
+        now = timezone.now()
+        orders = [create_order(self.customer, self.business) for _ in range(2)]
+        done = create_order(self.customer, self.business, status="cancelled")
+        Order.objects.filter(pk=done.pk).update(updated_at=now)
+
+        with mock.patch("orders_app.transitions.timezone.now", return_value=now):
+            moved = transitions.bulk_transition(
+                Order.objects.filter(pk__in=[order.pk for order in orders] + [done.pk]), "cancelled"
+            )
+        self.assertEqual(moved, [order.pk for order in orders])
+        self.assertEqual(OrderStats.objects.get(business_user=self.business).cancelled, 3)
+        self.assertEqual(OrderEvent.objects.filter(kind=OrderEvent.STATUS_CHANGED).count(), 2)
+
+    def test_bulk_transition_in_one_update(self):
+        orders = [create_order(self.customer, self.business) for _ in range(3)]
+        done = create_order(self.customer, self.business, status="completed")
+        foreign = create_order(self.customer, self.customer)
+        ids = [order.id for order in orders] + [done.id, foreign.id]
+
+        response = self.client.post(reverse("orders-bulk-status"), {"ids": ids, "status": "cancelled"}, format="json")
+        self.assertEqual(response.data, {"updated": ids[:3], "conflicts": sorted([done.id, foreign.id])})
+        self.assertEqual(
+            OrderStats.objects.values("in_progress", "completed", "cancelled").get(business_user=self.business),
+            {"in_progress": 0, "completed": 1, "cancelled": 3},
+        )
+
+
+class OrderArchiveTests(APITestCase):
+    """
+    Moving finished orders to ArchivedOrder and reading them back.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="client")
+        self.business = User.objects.create(username="studio")
+        old = timezone.now() - timedelta(days=400)
+        self.finished = [create_order(self.customer, self.business, status) for status in ("completed", "cancelled")]
+        self.finished.append(create_order(self.customer, self.business, "completed"))
+        self.active = create_order(self.customer, self.business)
+        self.recent = create_order(self.customer, self.business, "completed")
+        Order.objects.filter(pk__in=[order.pk for order in self.finished] + [self.active.pk]).update(updated_at=old)
+        self.client.force_authenticate(self.customer)
+
+    def get_stats(self):
+        return OrderStats.objects.values("in_progress", "completed", "cancelled").get(business_user=self.business)
+
+    def test_command_moves_old_finished_orders_in_batches_and_keeps_counters(self):
+        counters = self.get_stats()
+        summary = self.client.get(reverse("order-stats", args=[self.business.id])).data
+
+        output = StringIO()
+        call_command("archive_orders", "--days", "30", "--batch-size", "2", stdout=output)
+        self.assertIn("Archived 3 orders", output.getvalue())
+
+        archived = [order.pk for order in self.finished]
+        self.assertEqual(sorted(ArchivedOrder.objects.values_list("pk", flat=True)), archived)
+        self.assertEqual(sorted(Order.objects.values_list("pk", flat=True)), [self.active.pk, self.recent.pk])
+        self.assertEqual(ArchivedOrder.objects.get(pk=archived[1]).status, "cancelled")
+        self.assertEqual(self.get_stats(), counters)
+
+        cache.clear()
+        self.assertEqual(self.client.get(reverse("order-stats", args=[self.business.id])).data, summary)
+        output = StringIO()
+        call_command("rebuild_order_stats", stdout=output)
+        self.assertIn("0 were out of sync", output.getvalue())
+
+        call_command("archive_orders", "--days", "30", stdout=StringIO())
+        self.assertEqual(ArchivedOrder.objects.count(), 3)
+
+    def test_archive_endpoint_lists_only_archived_orders(self):
+        call_command("archive_orders", "--days", "30", "--status", "completed", stdout=StringIO())
+
+        response = self.client.get(reverse("orders-list"))
+        self.assertEqual(
+            [order["id"] for order in response.data["results"]], [self.recent.id, self.active.id, self.finished[1].id]
+        )
+
+        response = self.client.get(reverse("orders-archived"), {"page_size": 1})
+        self.assertEqual([order["id"] for order in response.data["results"]], [self.finished[2].id])
+        self.assertEqual(response.data["results"][0]["price"], "100.00")
+        self.assertIn("archived_at", response.data["results"][0])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([order["id"] for order in response.data["results"]], [self.finished[0].id])
+        self.assertIsNone(response.data["next"])
+
+        self.client.force_authenticate(User.objects.create(username="stranger"))
+        self.assertEqual(self.client.get(reverse("orders-archived")).data["results"], [])
+
+
+class OrderExportTests(APITestCase):
+    """
+    Streaming NDJSON/CSV export of a business user's orders.
+    """
+
+    def setUp(self):
+        self.customer = User.objects.create(username="payer")
+        self.business = User.objects.create(username="agency")
+        Profile.objects.create(user=self.business, type="business", email="agency@example.com")
+        self.orders = [create_order(self.customer, self.business, status) for status in ("completed", "in_progress")]
+        self.orders.append(create_order(self.customer, self.business))
+        create_order(self.customer, self.customer)
+        self.archived = self.orders[0]
+        Order.objects.filter(pk=self.archived.pk).update(updated_at=timezone.now() - timedelta(days=400))
+        call_command("archive_orders", "--days", "30", stdout=StringIO())
+        self.client.force_authenticate(self.business)
+
+    def export(self, params=None):
+        response = self.client.get(reverse("orders-export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_streams_hot_and_archived_orders_oldest_first(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [order.id for order in self.orders])
+        self.assertEqual(rows[0]["status"], "completed")
+        self.assertEqual(rows[0]["price"], "100.00")
+        self.assertEqual(rows[1]["business_user_id"], self.business.id)
+
+    def test_csv_with_status_and_date_filters(self):
+        content = self.export({"export_format": "csv", "status": "in_progress"})
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([int(row["id"]) for row in rows], [self.orders[1].id, self.orders[2].id])
+        self.assertEqual(rows[0]["features"], "[]")
+
+        since = self.orders[2].created_at.isoformat()
+        content = self.export({"export_format": "csv", "created_at__gte": since})
+        self.assertEqual([int(row["id"]) for row in csv.DictReader(StringIO(content))], [self.orders[2].id])
+
+    def test_rejects_customers_and_invalid_parameters(self):
+        self.assertEqual(self.client.get(reverse("orders-export"), {"export_format": "xml"}).status_code, 400)
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get(reverse("orders-export")).status_code, 403)
+
+    def test_command_writes_the_same_rows(self):
+        output = StringIO()
+        call_command("export_orders", str(self.business.id), "--chunk-size", "1", stdout=output)
+        self.assertEqual(output.getvalue(), self.export())
+
+
+@override_settings(ORDER_EVENTS_POLL_INTERVAL=0.01, ORDER_EVENTS_STREAM_TIMEOUT=0.05)
+class OrderEventTests(APITestCase):
+    """
+    OrderEvent log and the event stream and long-poll feeds built on it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="watcher")
+        self.business = User.objects.create(username="workshop")
+        Profile.objects.create(user=self.business, type="business", email="workshop@example.com")
+        self.token = Token.objects.create(user=self.customer)
+        self.first = create_order(self.customer, self.business)
+        self.second = create_order(self.customer, self.business)
+        create_order(self.business, self.business)
+        transitions.transition(self.first, "completed")
+
+    def get_events(self, user):
+        return list(
+            OrderEvent.objects.filter(customer_user=user).order_by("id").values_list("order_id", "kind", "old_status")
+        )
+
+    def test_log_covers_create_single_and_bulk_status_changes(self):
+        self.client.force_authenticate(self.business)
+        self.client.post(reverse("orders-bulk-status"), {"ids": [self.second.id], "status": "cancelled"}, format="json")
+        self.assertEqual(
+            self.get_events(self.customer),
+            [
+                (self.first.id, "created", None),
+                (self.second.id, "created", None),
+                (self.first.id, "status_changed", "in_progress"),
+                (self.second.id, "status_changed", "in_progress"),
+            ],
+        )
+
+    def test_long_poll_returns_events_after_cursor(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(reverse("order-events"), {"after": 0, "timeout": 0})
+        self.assertEqual(
+            [event["order"] for event in response.data["events"]], [self.first.id, self.second.id, self.first.id]
+        )
+        self.assertEqual(response.data["events"][2]["status"], "completed")
+
+        cursor = response.data["last_event_id"]
+        response = self.client.get(reverse("order-events"), {"after": cursor, "timeout": 0})
+        self.assertEqual(response.data, {"events": [], "last_event_id": cursor})
+        self.assertEqual(self.client.get(reverse("order-events"), {"after": "x"}).status_code, 400)
+        for timeout in ("nan", "inf", "-inf"):
+            response = self.client.get(reverse("order-events"), {"after": cursor, "timeout": timeout})
+            self.assertEqual(response.status_code, 400)
+
+
+@override_settings(ORDER_EVENTS_POLL_INTERVAL=0.01, ORDER_EVENTS_STREAM_TIMEOUT=0.05)
+class OrderEventStreamTests(APITransactionTestCase):
+    """
+    Server-Sent Events stream; its queries run on worker threads, so the data is committed.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create(username="watcher")
+        self.business = User.objects.create(username="workshop")
+        self.token = Token.objects.create(user=self.customer)
+        self.first = create_order(self.customer, self.business)
+        self.second = create_order(self.customer, self.business)
+        transitions.transition(self.first, "completed")
+
+    async def test_stream_resumes_from_last_event_id(self):
+        first_event = await OrderEvent.objects.filter(order_id=self.first.id).order_by("id").afirst()
+        response = await self.async_client.get(
+            reverse("order-events-stream"), {"token": self.token.key}, headers={"Last-Event-ID": str(first_event.id)}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        messages = [message for message in body.split("\n\n") if message.startswith("id:")]
+        self.assertEqual(len(messages), 2)
+        self.assertIn("event: created", messages[0])
+        self.assertIn(f'"order": {self.second.id}', messages[0])
+        self.assertIn("event: status_changed", messages[1])
+
+        response = await self.async_client.get(reverse("order-events-stream"))
+        self.assertEqual(response.status_code, 401)
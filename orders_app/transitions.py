@@ -0,0 +1,118 @@
+from collections import Counter
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from orders_app import events, stats
+from orders_app.models import Order, OrderEvent
+
+TRANSITIONS = {
+    "in_progress": {"completed", "cancelled"},
+}
+
+
+class OrderStatusConflict(APIException):
+    """
+    The order is not in a status from which the requested transition is allowed,
+    usually because another request changed it first.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The order status was changed by another request."
+    default_code = "conflict"
+
+
+def get_sources(new_status):
+    """
+    Return the statuses from which an order may move to new_status.
+
+    params:
+        new_status (str): Target status.
+    return:
+        list of str: Allowed source statuses.
+    """
+    return [source for source, targets in TRANSITIONS.items() if new_status in targets]
+
+
+def transition(order, new_status):
+    """
+    Move one order to new_status with a single conditional UPDATE.
+
+    Only status and updated_at are written, and only if the row still has the status the
+    order was loaded with, so concurrent updates cannot overwrite each other. Setting the
+    current status again is a no-op. The UPDATE, the counters and the OrderEvent are
+    written in one transaction.
+
+    params:
+        order (Order): Order as loaded from the database.
+        new_status (str): Target status.
+    return:
+        Order: The same order with status and updated_at set.
+    raise:
+        OrderStatusConflict: If the transition is not allowed or the row changed in the meantime.
+    """
+    old_status = getattr(order, "_loaded_status", order.status)
+    if new_status == old_status:
+        return order
+    if new_status not in TRANSITIONS.get(old_status, ()):
+        raise OrderStatusConflict(f"An order cannot change from '{old_status}' to '{new_status}'.")
+
+    now = timezone.now()
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order.pk, status=old_status).update(status=new_status, updated_at=now):
+            raise OrderStatusConflict()
+        order.status = order._loaded_status = new_status
+        order.updated_at = now
+        stats.record_status_change(order.business_user_id, old_status, new_status)
+        events.record(order, old_status)
+    return order
+
+
+def bulk_transition(queryset, new_status):
+    """
+    Move all orders of a queryset that are in an allowed source status to new_status.
+
+    Per source status, the matching rows are locked with SELECT ... FOR UPDATE and exactly
+    those IDs are moved with one UPDATE; orders in any other status are left untouched.
+    One OrderEvent per moved order is inserted in bulk. Call inside a transaction.
+
+    params:
+        queryset (QuerySet): Orders to move, e.g. filtered by ids and business user.
+        new_status (str): Target status.
+    return:
+        list of int: IDs of the orders that were moved.
+    raise:
+        OrderStatusConflict: If a locked row changed status before the UPDATE, which
+            only a database without row locks allows.
+    """
+    now = timezone.now()
+    moved = []
+    for source in get_sources(new_status):
+        rows = list(
+            queryset.filter(status=source)
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", "customer_user_id", "business_user_id")
+        )
+        if not rows:
+            continue
+        pks = [pk for pk, _, _ in rows]
+        if Order.objects.filter(pk__in=pks, status=source).update(status=new_status, updated_at=now) != len(pks):
+            raise OrderStatusConflict()
+        for business_user_id, count in Counter(owner for _, _, owner in rows).items():
+            stats.apply_deltas(business_user_id, {source: -count, new_status: count})
+        events.record_many(
+            [
+                OrderEvent(
+                    order_id=pk,
+                    customer_user_id=customer_user_id,
+                    business_user_id=business_user_id,
+                    kind=OrderEvent.STATUS_CHANGED,
+                    status=new_status,
+                    old_status=source,
+                )
+                for pk, customer_user_id, business_user_id in rows
+            ]
+        )
+        moved += pks
+    return moved
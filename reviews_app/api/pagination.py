@@ -0,0 +1,34 @@
+from base_app.api.pagination import KeysetPagination
+
+
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for reviews on (updated_at, id) or (rating, id).
+
+    ?ordering selects the keyset: updated_at, -updated_at (default), rating or -rating.
+    Each has a matching index, globally and per business user, so a page reads at most
+    page_size + 1 index entries however many reviews a business has.
+    """
+
+    page_size = 20
+    ordering = ("-updated_at", "-id")
+    orderings = {
+        "updated_at": ("updated_at", "id"),
+        "-updated_at": ("-updated_at", "-id"),
+        "rating": ("rating", "id"),
+        "-rating": ("-rating", "-id"),
+    }
+    ordering_query_param = "ordering"
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the keyset selected by ?ordering, the default for missing or unknown values.
+
+        params:
+            request (Request): The current request.
+            queryset (QuerySet): The filtered queryset.
+            view (APIView): The calling view.
+        return:
+            tuple: Ordering fields, prefixed with "-" for descending.
+        """
+        return self.orderings.get(request.query_params.get(self.ordering_query_param), self.ordering)
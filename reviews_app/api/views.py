@@ -1,7 +1,10 @@
-from rest_framework import viewsets, filters, permissions
+from rest_framework import viewsets, permissions
+from django.db import IntegrityError, transaction
 from django_filters.rest_framework import DjangoFilterBackend
+from reviews_app import ratings
 from reviews_app.models import Review
 from .serializers import ReviewSerializer
+from .pagination import ReviewCursorPagination
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsCustomerOrAdmin, IsReviewerOrAdmin
 from rest_framework import serializers
@@ -15,10 +18,11 @@ class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ReviewCursorPagination
 
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    # ?ordering (rating / updated_at) is applied by ReviewCursorPagination.
+    filter_backends = [DjangoFilterBackend]
     filterset_fields = ["business_user", "reviewer"]
-    ordering_fields = ["rating", "updated_at"]
 
     def get_permissions(self):
         """
@@ -49,31 +53,80 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """
-        Create a new review, ensuring a user can only review a business once.
+        Create a new review, ensuring a user can only review a business once, and add it
+        to the business user's rating in the same transaction.
+
+        The rule is enforced by the review_unique_business_reviewer constraint, so this is
+        a single INSERT; a duplicate fails with an IntegrityError, also under concurrent requests.
+        Only then is the existing review looked up, so other integrity errors are re-raised.
 
         params:
             serializer (Serializer): The validated serializer instance.
         raise:
             ValidationError: If the user has already reviewed the business.
+            IntegrityError: If the insert failed for any other reason.
         """
-        business_user = serializer.validated_data["business_user"]
-        if Review.objects.filter(reviewer=self.request.user, business_user=business_user).exists():
+        try:
+            with transaction.atomic():
+                review = serializer.save(reviewer=self.request.user)
+                ratings.apply_change(review.business_user_id, new_rating=review.rating)
+        except IntegrityError:
+            business_user = serializer.validated_data["business_user"]
+            if not Review.objects.filter(business_user=business_user, reviewer=self.request.user).exists():
+                raise
             raise serializers.ValidationError({"detail": "You have already submitted a review for this business user."})
-        serializer.save(reviewer=self.request.user)
+
+    def perform_update(self, serializer):
+        """
+        Save the review and move its rating in the business user's aggregates in the same transaction.
+
+        params:
+            serializer (Serializer): The validated serializer instance.
+        """
+        old_business_user_id, old_rating = serializer.instance.business_user_id, serializer.instance.rating
+        with transaction.atomic():
+            review = serializer.save()
+            if review.business_user_id == old_business_user_id:
+                ratings.apply_change(old_business_user_id, old_rating, review.rating)
+            else:
+                ratings.apply_change(old_business_user_id, old_rating=old_rating)
+                ratings.apply_change(review.business_user_id, new_rating=review.rating)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the review and remove it from the business user's aggregates in the same transaction.
+
+        params:
+            instance (Review): The review to delete.
+        """
+        with transaction.atomic():
+            instance.delete()
+            ratings.apply_change(instance.business_user_id, old_rating=instance.rating)
 
     def get_queryset(self):
         """
         Filter the queryset based on optional query parameters.
 
+        business_user_id is served by the (business_user, updated_at / rating, id) indexes in
+        keyset order, reviewer_id by the reviewer foreign key index.
+
         return:
-            QuerySet: Filtered reviews based on business_user_id and reviewer_id.
+            QuerySet: Filtered reviews based on business_user_id, reviewer_id and min_rating.
+        raise:
+            ValidationError: If min_rating is not a number.
         """
         queryset = super().get_queryset()
         business_user_id = self.request.query_params.get("business_user_id")
         reviewer_id = self.request.query_params.get("reviewer_id")
+        min_rating = self.request.query_params.get("min_rating")
 
         if business_user_id:
             queryset = queryset.filter(business_user_id=business_user_id)
         if reviewer_id:
             queryset = queryset.filter(reviewer_id=reviewer_id)
+        if min_rating:
+            try:
+                queryset = queryset.filter(rating__gte=float(min_rating))
+            except ValueError:
+                raise serializers.ValidationError({"min_rating": "A number is required."})
         return queryset
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from reviews_app import ratings
+
+
+class Command(BaseCommand):
+    """
+    Reconcile the materialized BusinessRating rows with the Review table.
+    """
+
+    help = "Recompute the per-business rating aggregates from Review."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", nargs="+", type=int, help="Only rebuild the ratings of these business users.")
+
+    def handle(self, *args, **options):
+        """
+        Aggregate reviews per business user and overwrite the stored ratings.
+
+        params:
+            options (dict): Parsed command line options.
+        """
+        written, out_of_sync = ratings.rebuild(options["users"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt ratings for {written} business users, {out_of_sync} were out of sync.")
+        )
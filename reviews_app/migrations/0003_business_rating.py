@@ -0,0 +1,56 @@
+# Generated by Django 5.2 on 2026-10-17 03:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_business_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRating = apps.get_model('reviews_app', 'BusinessRating')
+    stars = {
+        'stars_1': Q(rating__lt=1.5),
+        'stars_2': Q(rating__gte=1.5, rating__lt=2.5),
+        'stars_3': Q(rating__gte=2.5, rating__lt=3.5),
+        'stars_4': Q(rating__gte=3.5, rating__lt=4.5),
+        'stars_5': Q(rating__gte=4.5),
+    }
+    rows = (
+        Review.objects.order_by()
+        .values('business_user_id')
+        .annotate(count=Count('pk'), total=Sum('rating'), **{name: Count('pk', filter=condition) for name, condition in stars.items()})
+    )
+    BusinessRating.objects.bulk_create(
+        [BusinessRating(average=row['total'] / row['count'], **row) for row in rows], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0002_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRating',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='business_rating', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('average', models.FloatField(blank=True, null=True)),
+                ('stars_1', models.IntegerField(default=0)),
+                ('stars_2', models.IntegerField(default=0)),
+                ('stars_3', models.IntegerField(default=0)),
+                ('stars_4', models.IntegerField(default=0)),
+                ('stars_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['average'], name='business_rating_average_idx'), models.Index(fields=['count'], name='business_rating_count_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_business_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-17 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    """
+    Keep only the most recently updated review of every reviewer and business user pair
+    and recompute the ratings of the business users that lost reviews.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRating = apps.get_model('reviews_app', 'BusinessRating')
+    latest = Review.objects.filter(
+        business_user_id=OuterRef('business_user_id'), reviewer_id=OuterRef('reviewer_id')
+    ).order_by('-updated_at', '-id')
+    duplicates = Review.objects.exclude(pk=Subquery(latest.values('pk')[:1]))
+    business_user_ids = set(duplicates.values_list('business_user_id', flat=True))
+    if not business_user_ids:
+        return
+    duplicates.delete()
+
+    stars = {
+        'stars_1': Q(rating__lt=1.5),
+        'stars_2': Q(rating__gte=1.5, rating__lt=2.5),
+        'stars_3': Q(rating__gte=2.5, rating__lt=3.5),
+        'stars_4': Q(rating__gte=3.5, rating__lt=4.5),
+        'stars_5': Q(rating__gte=4.5),
+    }
+    rows = (
+        Review.objects.filter(business_user_id__in=business_user_ids)
+        .order_by()
+        .values('business_user_id')
+        .annotate(count=Count('pk'), total=Sum('rating'), **{name: Count('pk', filter=condition) for name, condition in stars.items()})
+    )
+    BusinessRating.objects.filter(business_user_id__in=business_user_ids).delete()
+    BusinessRating.objects.bulk_create([BusinessRating(average=row['total'] / row['count'], **row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0003_business_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('business_user', 'reviewer'), name='review_unique_business_reviewer'),
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_business_reviewer_idx',
+        ),
+    ]
@@ -13,3 +13,43 @@ class Review(models.Model):
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # One review per reviewer and business user; its index also serves business_user filters.
+            models.UniqueConstraint(fields=["business_user", "reviewer"], name="review_unique_business_reviewer"),
+        ]
+        indexes = [
+            # Keysets of ReviewCursorPagination, overall and per business user.
+            models.Index(fields=["updated_at", "id"], name="review_updated_idx"),
+            models.Index(fields=["rating", "id"], name="review_rating_idx"),
+            models.Index(fields=["business_user", "updated_at", "id"], name="review_business_updated_idx"),
+            models.Index(fields=["business_user", "rating", "id"], name="review_business_rating_idx"),
+        ]
+
+
+class BusinessRating(models.Model):
+    """
+    Materialized review aggregates for one business user: count, sum, average and a 1-5 histogram.
+
+    Kept in sync by reviews_app.ratings; rebuild_business_ratings recomputes it from Review.
+    """
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name="business_rating", on_delete=models.CASCADE
+    )
+    count = models.IntegerField(default=0)
+    total = models.FloatField(default=0)
+    average = models.FloatField(null=True, blank=True)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["average"], name="business_rating_average_idx"),
+            models.Index(fields=["count"], name="business_rating_count_idx"),
+        ]
@@ -0,0 +1,170 @@
+import math
+from functools import partial
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from base_app import counters
+from reviews_app.models import BusinessRating, Review
+
+STARS = (1, 2, 3, 4, 5)
+FIELDS = ("count", "total", "average", *(f"stars_{star}" for star in STARS))
+
+
+def get_star(rating):
+    """
+    Return the histogram bucket of a rating: rounded half up and clamped to 1-5.
+
+    params:
+        rating (float): Rating of a review.
+    return:
+        int: Star bucket from 1 to 5.
+    """
+    return min(max(math.floor(rating + 0.5), STARS[0]), STARS[-1])
+
+
+def _star_condition(star):
+    """
+    Build the Review filter of one histogram bucket, matching get_star.
+
+    params:
+        star (int): Star bucket from 1 to 5.
+    return:
+        Q: Condition on Review.rating.
+    """
+    condition = Q()
+    if star > STARS[0]:
+        condition &= Q(rating__gte=star - 0.5)
+    if star < STARS[-1]:
+        condition &= Q(rating__lt=star + 0.5)
+    return condition
+
+
+def get_aggregates():
+    """
+    Return the expressions that compute a rating row from Review in one grouped query.
+
+    return:
+        dict: Field name mapped to aggregate expression, without average.
+    """
+    aggregates = {"count": Count("pk"), "total": Coalesce(Sum("rating"), Value(0.0))}
+    for star in STARS:
+        aggregates[f"stars_{star}"] = Count("pk", filter=_star_condition(star))
+    return aggregates
+
+
+def count_ratings(business_user_id):
+    """
+    Aggregate the reviews of one business user, straight from Review.
+
+    params:
+        business_user_id (int): ID of the business user.
+    return:
+        dict: Values for every field in FIELDS.
+    """
+    row = Review.objects.filter(business_user_id=business_user_id).aggregate(**get_aggregates())
+    row["average"] = row["total"] / row["count"] if row["count"] else None
+    return row
+
+
+def apply_change(business_user_id, old_rating=None, new_rating=None):
+    """
+    Move a business user's aggregates by one added, changed or removed review in one UPDATE.
+
+    Call after the review itself was written, in the same transaction. If the user has no
+    row yet and a review was added, the row is created from a recount of Review, which
+    already includes it.
+
+    params:
+        business_user_id (int): ID of the business user.
+        old_rating (float, optional): Rating before the change, None for a new review.
+        new_rating (float, optional): Rating after the change, None for a deleted review.
+    """
+    if old_rating == new_rating:
+        return
+    count_delta = (new_rating is not None) - (old_rating is not None)
+    total_delta = (new_rating or 0) - (old_rating or 0)
+    stars = {}
+    if old_rating is not None:
+        stars[get_star(old_rating)] = -1
+    if new_rating is not None:
+        stars[get_star(new_rating)] = stars.get(get_star(new_rating), 0) + 1
+
+    count = F("count") + count_delta
+    total = F("total") + total_delta
+    changes = {
+        "count": count,
+        "total": total,
+        # The right-hand sides read the row as it was before this UPDATE.
+        "average": Case(When(count__gt=-count_delta, then=total / count), default=None, output_field=FloatField()),
+        **{f"stars_{star}": F(f"stars_{star}") + delta for star, delta in stars.items() if delta},
+    }
+    counters.update_or_recount(
+        BusinessRating,
+        {"business_user_id": business_user_id},
+        changes,
+        partial(count_ratings, business_user_id),
+        create=new_rating is not None,
+    )
+
+
+def to_representation(rating):
+    """
+    Serialize a business user's aggregates for profile responses.
+
+    params:
+        rating (BusinessRating or None): The row, None if the user has never been reviewed.
+    return:
+        dict: count, average rounded to two places and histogram by star.
+    """
+    if rating is None:
+        return {"count": 0, "average": None, "histogram": {str(star): 0 for star in STARS}}
+    return {
+        "count": rating.count,
+        "average": round(rating.average, 2) if rating.average is not None else None,
+        "histogram": {str(star): getattr(rating, f"stars_{star}") for star in STARS},
+    }
+
+
+def rebuild(business_user_ids=None):
+    """
+    Recompute aggregates from Review with one grouped query and write them back in one transaction,
+    see counters.replace_all.
+
+    params:
+        business_user_ids (list of int, optional): Limit the rebuild to these business users.
+    return:
+        tuple: (number of rows written, number of rows that were out of sync)
+    """
+    reviews = Review.objects.all()
+    ratings = BusinessRating.objects.all()
+    if business_user_ids:
+        reviews = reviews.filter(business_user_id__in=business_user_ids)
+        ratings = ratings.filter(business_user_id__in=business_user_ids)
+
+    expected = {}
+    for row in reviews.order_by().values("business_user_id").annotate(**get_aggregates()):
+        row["average"] = row["total"] / row["count"]
+        expected[row.pop("business_user_id")] = row
+
+    empty = {"count": 0, "total": 0, "average": None, **{f"stars_{star}": 0 for star in STARS}}
+    return counters.replace_all(ratings, "business_user", expected, empty, same=_same)
+
+
+def _same(expected, current):
+    """
+    Compare two rating rows, allowing for float rounding in total and average.
+
+    params:
+        expected (dict): Recomputed values.
+        current (dict or None): Stored values, None if there is no row.
+    return:
+        bool: Whether the stored row matches.
+    """
+    if current is None:
+        return False
+    for field in FIELDS:
+        if isinstance(expected[field], float) and current[field] is not None:
+            if not math.isclose(expected[field], current[field], abs_tol=1e-9):
+                return False
+        elif expected[field] != current[field]:
+            return False
+    return True
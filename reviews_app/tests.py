@@ -1,3 +1,177 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from reviews_app.api.pagination import ReviewCursorPagination
+from reviews_app.models import BusinessRating, Review
 
-# Create your tests here.
+
+class BusinessRatingTests(APITestCase):
+    """
+    Per-business rating aggregates maintained by ReviewViewSet.
+    """
+
+    def setUp(self):
+        self.business = User.objects.create(username="bakery")
+        Profile.objects.create(user=self.business, type="business", email="bakery@example.com")
+        self.other = User.objects.create(username="butcher")
+        Profile.objects.create(user=self.other, type="business", email="butcher@example.com")
+        self.customers = []
+        for index in range(2):
+            customer = User.objects.create(username=f"guest{index}")
+            Profile.objects.create(user=customer, type="customer", email=f"guest{index}@example.com")
+            self.customers.append(customer)
+
+    def review(self, customer, business, rating):
+        self.client.force_authenticate(customer)
+        response = self.client.post(
+            reverse("reviews-list"), {"business_user": business.id, "rating": rating, "description": "Fine"}
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def get_rating(self, business):
+        return BusinessRating.objects.values("count", "total", "average", "stars_4", "stars_5").get(
+            business_user=business
+        )
+
+    def test_create_update_and_delete_keep_aggregates_in_sync(self):
+        first = self.review(self.customers[0], self.business, 5)
+        self.review(self.customers[1], self.business, 4)
+        self.assertEqual(
+            self.get_rating(self.business), {"count": 2, "total": 9, "average": 4.5, "stars_4": 1, "stars_5": 1}
+        )
+
+        self.client.force_authenticate(self.customers[0])
+        self.client.patch(reverse("reviews-detail", args=[first]), {"rating": 4})
+        self.assertEqual(
+            self.get_rating(self.business), {"count": 2, "total": 8, "average": 4, "stars_4": 2, "stars_5": 0}
+        )
+
+        self.client.delete(reverse("reviews-detail", args=[first]))
+        self.client.force_authenticate(self.customers[1])
+        self.client.delete(reverse("reviews-detail", args=[Review.objects.get().id]))
+        self.assertEqual(
+            self.get_rating(self.business), {"count": 0, "total": 0, "average": None, "stars_4": 0, "stars_5": 0}
+        )
+
+    def test_rating_on_profiles_with_filter_and_ordering(self):
+        self.review(self.customers[0], self.business, 3)
+        self.review(self.customers[0], self.other, 5)
+        self.review(self.customers[1], self.other, 4)
+
+        response = self.client.get(reverse("profile-detail", args=[self.other.id]))
+        self.assertEqual(
+            response.data["rating"], {"count": 2, "average": 4.5, "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1}}
+        )
+
+        url = reverse("business-profile-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"ordering": "-rating"})
+        self.assertEqual([profile["user"]["pk"] for profile in response.data], [self.other.id, self.business.id])
+        response = self.client.get(url, {"min_rating": 4})
+        self.assertEqual([profile["user"]["pk"] for profile in response.data], [self.other.id])
+        self.assertEqual(self.client.get(url, {"min_rating": "high"}).status_code, 400)
+
+    def test_rebuild_command_repairs_drift(self):
+        self.review(self.customers[0], self.business, 2)
+        BusinessRating.objects.filter(business_user=self.business).update(count=9, stars_5=3)
+
+        output = StringIO()
+        call_command("rebuild_business_ratings", stdout=output)
+        self.assertIn("1 were out of sync", output.getvalue())
+        self.assertEqual(
+            BusinessRating.objects.values("count", "average", "stars_2", "stars_5").get(business_user=self.business),
+            {"count": 1, "average": 2, "stars_2": 1, "stars_5": 0},
+        )
+
+
+class SingleReviewRuleTests(APITestCase):
+    """
+    One review per reviewer and business user, enforced by a unique constraint.
+    """
+
+    def setUp(self):
+        self.business = User.objects.create(username="tailor")
+        Profile.objects.create(user=self.business, type="business", email="tailor@example.com")
+        self.customer = User.objects.create(username="patron")
+        Profile.objects.create(user=self.customer, type="customer", email="patron@example.com")
+        self.client.force_authenticate(self.customer)
+        self.data = {"business_user": self.business.id, "rating": 4, "description": "Good"}
+
+    def test_create_is_one_insert_and_duplicates_get_the_validation_error(self):
+        BusinessRating.objects.create(business_user=self.business)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(reverse("reviews-list"), self.data)
+        self.assertEqual(response.status_code, 201)
+        review_queries = [query["sql"] for query in captured if '"reviews_app_review"' in query["sql"]]
+        self.assertEqual(len(review_queries), 1)
+        self.assertTrue(review_queries[0].startswith("INSERT"))
+
+        response = self.client.post(reverse("reviews-list"), {**self.data, "rating": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"detail": "You have already submitted a review for this business user."})
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(BusinessRating.objects.get(business_user=self.business).count, 1)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        with mock.patch("reviews_app.ratings.apply_change", side_effect=IntegrityError("NOT NULL constraint failed")):
+            with self.assertRaises(IntegrityError):
+                self.client.post(reverse("reviews-list"), self.data)
+        self.assertFalse(Review.objects.exists())
+
+
+class ReviewPaginationTests(APITestCase):
+    """
+    Keyset pagination of the review list on (updated_at, id) and (rating, id).
+    """
+
+    def setUp(self):
+        self.business = User.objects.create(username="florist")
+        self.other = User.objects.create(username="grocer")
+        ratings = [3, 5, 1, 5, 4]
+        self.reviews = []
+        for index, rating in enumerate(ratings):
+            reviewer = User.objects.create(username=f"critic{index}")
+            self.reviews.append(
+                Review.objects.create(business_user=self.business, reviewer=reviewer, rating=rating, description="Ok")
+            )
+        Review.objects.create(business_user=self.other, reviewer=reviewer, rating=2, description="Meh")
+        self.client.force_authenticate(self.business)
+
+    def collect(self, params):
+        ids = []
+        url = reverse("reviews-list")
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            ids += [review["id"] for review in response.data["results"]]
+            url, params = response.data["next"], None
+        return ids
+
+    def test_walks_newest_first_by_default(self):
+        expected = [review.id for review in reversed(self.reviews)]
+        self.assertEqual(self.collect({"business_user_id": self.business.id, "page_size": 2}), expected)
+
+    def test_orders_by_rating_with_min_rating(self):
+        params = {"business_user_id": self.business.id, "ordering": "-rating", "min_rating": 4, "page_size": 2}
+        expected = [self.reviews[3].id, self.reviews[1].id, self.reviews[4].id]
+        self.assertEqual(self.collect(params), expected)
+
+        response = self.client.get(reverse("reviews-list"), {"min_rating": "best"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_malformed_cursor_is_not_found(self):
+        response = self.client.get(reverse("reviews-list"), {"cursor": "W251bGwsbnVsbF0="})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get(reverse("reviews-list"), {"page_size": 1000})
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(ReviewCursorPagination.max_page_size, 100)